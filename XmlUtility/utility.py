@@ -1,145 +1,201 @@
+import logging
 import os
 import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from faker import Faker
-import xml.etree.ElementTree as ET
+from lxml import etree
 from datetime import datetime, timedelta
 
-# Initialize Faker
-fake = Faker()
+# Initialize Faker (one shared instance per locale; weighting off for faster element picks)
+@lru_cache(maxsize=None)
+def get_faker(locale=None):
+    return Faker(locale, use_weighting=False)
+
+fake = get_faker()
+
+log = logging.getLogger(__name__)
+
+NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"
+
+# Set to False to write compact XML and skip the indentation pass entirely
+PRETTY_PRINT = True
 
 # Output directory
 OUTPUT_DIR = 'generated_camt053_001_02'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Output files are written through a large buffer to avoid a syscall per small write
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Fixed value pools
+CURRENCIES = ('USD', 'EUR', 'INR', 'GBP', 'JPY')
+STATUSES = ('BOOK', 'PDNG', 'RCVD')
+CRDT_DBIT = ('CRDT', 'DBIT')
+BOOLEANS = ('true', 'false')
+COIN_FLIP = (True, False)
+
+# One shared random.Random instance, with its hot methods bound once at import
+_prng = random.Random()
+_uniform = _prng.uniform
+_choice = _prng.choice
+_randint = _prng.randint
+
 # Helper functions
 def random_decimal():
-    return str(round(random.uniform(100, 10000), 2))
+    return f"{_uniform(100, 10000):.2f}"
+
+random_currency = partial(_choice, CURRENCIES)
 
-def random_currency():
-    return random.choice(['USD', 'EUR', 'INR', 'GBP', 'JPY'])
+# Dates are generated relative to a single "now" taken at startup
+NOW = datetime.now()
 
 def random_date():
-    return (datetime.now() - timedelta(days=random.randint(0, 1000))).strftime("%Y-%m-%d")
+    return (NOW - timedelta(days=_randint(0, 1000))).strftime("%Y-%m-%d")
 
 def random_datetime():
-    return (datetime.now() - timedelta(days=random.randint(0, 1000))).strftime("%Y-%m-%dT%H:%M:%S")
-
-def indent(elem, level=0):
-    i = "\n" + level * "  "
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + "  "
-        for child in elem:
-            indent(child, level + 1)
-        if not child.tail or not child.tail.strip():
-            child.tail = i
-    if level and (not elem.tail or not elem.tail.strip()):
-        elem.tail = i
+    return (NOW - timedelta(days=_randint(0, 1000))).strftime("%Y-%m-%dT%H:%M:%S")
+
+def write_break(xf, level):
+    if PRETTY_PRINT:
+        xf.write('\n' + '  ' * level)
+
+@contextmanager
+def open_document(filename):
+    """Streams a CAMT.053 Document to `filename`, yielding the writer inside BkToCstmrStmt."""
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as fh, etree.xmlfile(fh, encoding='utf-8') as xf:
+        xf.write_declaration()
+        with xf.element('Document', nsmap={None: NAMESPACE}):
+            write_break(xf, 1)
+            with xf.element('BkToCstmrStmt'):
+                yield xf
+                write_break(xf, 1)
+            write_break(xf, 0)
+
+def write_block(xf, elem, level=2):
+    """Writes a finished subtree straight to the file, indented at its nesting depth if enabled."""
+    if PRETTY_PRINT:
+        etree.indent(elem, space='  ', level=level)
+    write_break(xf, level)
+    xf.write(elem)
+
+def seed_worker():
+    """Reseeds a worker process so forked workers don't all replay the parent's random streams."""
+    _prng.seed()
+    fake.seed_instance(_prng.getrandbits(64))
 
 # Main generator function
 def create_camt053_001_02_xml(file_number, entries_per_stmt=2):
-    Document = ET.Element('Document', xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02")
-    BkToCstmrStmt = ET.SubElement(Document, 'BkToCstmrStmt')
-
-    # GrpHdr
-    GrpHdr = ET.SubElement(BkToCstmrStmt, 'GrpHdr')
-    ET.SubElement(GrpHdr, 'MsgId').text = fake.uuid4()
-    ET.SubElement(GrpHdr, 'CreDtTm').text = random_datetime()
-
-    if random.choice([True, False]):
-        MsgRcpt = ET.SubElement(GrpHdr, 'MsgRcpt')
-        ET.SubElement(MsgRcpt, 'Nm').text = fake.name()
-        Id = ET.SubElement(MsgRcpt, 'Id')
-        OrgId = ET.SubElement(Id, 'OrgId')
-        Othr = ET.SubElement(OrgId, 'Othr')
-        ET.SubElement(Othr, 'Id').text = fake.uuid4()
-
-    # One or more statements
-    for stmt_index in range(random.randint(1, 2)):
-        Stmt = ET.SubElement(BkToCstmrStmt, 'Stmt')
-        ET.SubElement(Stmt, 'Id').text = fake.uuid4()
-        ET.SubElement(Stmt, 'ElctrncSeqNb').text = str(random.randint(1, 1000))
-        ET.SubElement(Stmt, 'LglSeqNb').text = str(random.randint(1, 1000))
-        ET.SubElement(Stmt, 'CreDtTm').text = random_datetime()
-
-        if random.choice([True, False]):
-            FrToDt = ET.SubElement(Stmt, 'FrToDt')
-            ET.SubElement(FrToDt, 'FrDtTm').text = random_datetime()
-            ET.SubElement(FrToDt, 'ToDtTm').text = random_datetime()
-
-        Acct = ET.SubElement(Stmt, 'Acct')
-        Id = ET.SubElement(Acct, 'Id')
-        Othr = ET.SubElement(Id, 'Othr')
-        ET.SubElement(Othr, 'Id').text = fake.uuid4()
-        Tp = ET.SubElement(Acct, 'Tp')
-        ET.SubElement(Tp, 'Prtry').text = fake.word()
-        ET.SubElement(Acct, 'Ccy').text = random_currency()
-        ET.SubElement(Acct, 'Nm').text = fake.name()
-
-        Svcr = ET.SubElement(Acct, 'Svcr')
-        FinInstnId = ET.SubElement(Svcr, 'FinInstnId')
-        if random.choice([True, False]):
-            ET.SubElement(FinInstnId, 'BIC').text = fake.swift()
-        if random.choice([True, False]):
-            ET.SubElement(FinInstnId, 'Nm').text = fake.company()
-
-        for _ in range(random.randint(1, 2)):
-            Bal = ET.SubElement(Stmt, 'Bal')
-            Tp = ET.SubElement(Bal, 'Tp')
-            CdOrPrtry = ET.SubElement(Tp, 'CdOrPrtry')
-            ET.SubElement(CdOrPrtry, 'Cd').text = fake.word()
-            Amt = ET.SubElement(Bal, 'Amt', Ccy=random_currency())
-            Amt.text = random_decimal()
-            ET.SubElement(Bal, 'CdtDbtInd').text = random.choice(['CRDT', 'DBIT'])
-            Dt = ET.SubElement(Bal, 'Dt')
-            ET.SubElement(Dt, 'DtTm').text = random_datetime()
-
-        if random.choice([True, False]):
-            TxsSummry = ET.SubElement(Stmt, 'TxsSummry')
-            TtlNtries = ET.SubElement(TxsSummry, 'TtlNtries')
-            ET.SubElement(TtlNtries, 'NbOfNtries').text = str(random.randint(1, 10))
-            ET.SubElement(TtlNtries, 'Sum').text = random_decimal()
-            ET.SubElement(TtlNtries, 'TtlNetNtryAmt').text = random_decimal()
-            ET.SubElement(TtlNtries, 'CdtDbtInd').text = random.choice(['CRDT', 'DBIT'])
-
-            if random.choice([True, False]):
-                TtlCdtNtries = ET.SubElement(TxsSummry, 'TtlCdtNtries')
-                ET.SubElement(TtlCdtNtries, 'NbOfNtries').text = str(random.randint(1, 10))
-                ET.SubElement(TtlCdtNtries, 'Sum').text = random_decimal()
-
-            if random.choice([True, False]):
-                TtlDbtNtries = ET.SubElement(TxsSummry, 'TtlDbtNtries')
-                ET.SubElement(TtlDbtNtries, 'NbOfNtries').text = str(random.randint(1, 10))
-                ET.SubElement(TtlDbtNtries, 'Sum').text = random_decimal()
-
-        for _ in range(entries_per_stmt):
-            Ntry = ET.SubElement(Stmt, 'Ntry')
-            ET.SubElement(Ntry, 'NtryRef').text = fake.uuid4()
-            Amt = ET.SubElement(Ntry, 'Amt', Ccy=random_currency())
-            Amt.text = random_decimal()
-            ET.SubElement(Ntry, 'CdtDbtInd').text = random.choice(['CRDT', 'DBIT'])
-            ET.SubElement(Ntry, 'RvslInd').text = random.choice(['true', 'false'])
-            ET.SubElement(Ntry, 'Sts').text = random.choice(['BOOK', 'PDNG', 'RCVD'])
-            BookgDt = ET.SubElement(Ntry, 'BookgDt')
-            ET.SubElement(BookgDt, 'DtTm').text = random_datetime()
-            ValDt = ET.SubElement(Ntry, 'ValDt')
-            ET.SubElement(ValDt, 'Dt').text = random_date()
-
-            # Placeholders for optional anyType fields
-            if random.choice([True, False]):
-                ET.SubElement(Ntry, 'BkTxCd')
-            if random.choice([True, False]):
-                ET.SubElement(Ntry, 'NtryDtls')
-
-    indent(Document)
-    tree = ET.ElementTree(Document)
     filename = os.path.join(OUTPUT_DIR, f'camt053_001_02_{file_number}.xml')
-    tree.write(filename, encoding='utf-8', xml_declaration=True)
-    print(f'Generated file: {filename}')
+    with open_document(filename) as xf:
+        # GrpHdr
+        GrpHdr = etree.Element('GrpHdr')
+        etree.SubElement(GrpHdr, 'MsgId').text = uuid.uuid4().hex
+        etree.SubElement(GrpHdr, 'CreDtTm').text = random_datetime()
+
+        if _choice(COIN_FLIP):
+            MsgRcpt = etree.SubElement(GrpHdr, 'MsgRcpt')
+            etree.SubElement(MsgRcpt, 'Nm').text = fake.name()
+            Id = etree.SubElement(MsgRcpt, 'Id')
+            OrgId = etree.SubElement(Id, 'OrgId')
+            Othr = etree.SubElement(OrgId, 'Othr')
+            etree.SubElement(Othr, 'Id').text = uuid.uuid4().hex
+
+        write_block(xf, GrpHdr)
+
+        # One or more statements
+        for stmt_index in range(_randint(1, 2)):
+            Stmt = etree.Element('Stmt')
+            etree.SubElement(Stmt, 'Id').text = uuid.uuid4().hex
+            etree.SubElement(Stmt, 'ElctrncSeqNb').text = str(_randint(1, 1000))
+            etree.SubElement(Stmt, 'LglSeqNb').text = str(_randint(1, 1000))
+            etree.SubElement(Stmt, 'CreDtTm').text = random_datetime()
+
+            if _choice(COIN_FLIP):
+                FrToDt = etree.SubElement(Stmt, 'FrToDt')
+                etree.SubElement(FrToDt, 'FrDtTm').text = random_datetime()
+                etree.SubElement(FrToDt, 'ToDtTm').text = random_datetime()
+
+            Acct = etree.SubElement(Stmt, 'Acct')
+            Id = etree.SubElement(Acct, 'Id')
+            Othr = etree.SubElement(Id, 'Othr')
+            etree.SubElement(Othr, 'Id').text = uuid.uuid4().hex
+            Tp = etree.SubElement(Acct, 'Tp')
+            etree.SubElement(Tp, 'Prtry').text = fake.word()
+            etree.SubElement(Acct, 'Ccy').text = random_currency()
+            etree.SubElement(Acct, 'Nm').text = fake.name()
+
+            Svcr = etree.SubElement(Acct, 'Svcr')
+            FinInstnId = etree.SubElement(Svcr, 'FinInstnId')
+            if _choice(COIN_FLIP):
+                etree.SubElement(FinInstnId, 'BIC').text = fake.swift()
+            if _choice(COIN_FLIP):
+                etree.SubElement(FinInstnId, 'Nm').text = fake.company()
+
+            for _ in range(_randint(1, 2)):
+                Bal = etree.SubElement(Stmt, 'Bal')
+                Tp = etree.SubElement(Bal, 'Tp')
+                CdOrPrtry = etree.SubElement(Tp, 'CdOrPrtry')
+                etree.SubElement(CdOrPrtry, 'Cd').text = fake.word()
+                Amt = etree.SubElement(Bal, 'Amt', Ccy=random_currency())
+                Amt.text = random_decimal()
+                etree.SubElement(Bal, 'CdtDbtInd').text = _choice(CRDT_DBIT)
+                Dt = etree.SubElement(Bal, 'Dt')
+                etree.SubElement(Dt, 'DtTm').text = random_datetime()
+
+            if _choice(COIN_FLIP):
+                TxsSummry = etree.SubElement(Stmt, 'TxsSummry')
+                TtlNtries = etree.SubElement(TxsSummry, 'TtlNtries')
+                etree.SubElement(TtlNtries, 'NbOfNtries').text = str(_randint(1, 10))
+                etree.SubElement(TtlNtries, 'Sum').text = random_decimal()
+                etree.SubElement(TtlNtries, 'TtlNetNtryAmt').text = random_decimal()
+                etree.SubElement(TtlNtries, 'CdtDbtInd').text = _choice(CRDT_DBIT)
+
+                if _choice(COIN_FLIP):
+                    TtlCdtNtries = etree.SubElement(TxsSummry, 'TtlCdtNtries')
+                    etree.SubElement(TtlCdtNtries, 'NbOfNtries').text = str(_randint(1, 10))
+                    etree.SubElement(TtlCdtNtries, 'Sum').text = random_decimal()
+
+                if _choice(COIN_FLIP):
+                    TtlDbtNtries = etree.SubElement(TxsSummry, 'TtlDbtNtries')
+                    etree.SubElement(TtlDbtNtries, 'NbOfNtries').text = str(_randint(1, 10))
+                    etree.SubElement(TtlDbtNtries, 'Sum').text = random_decimal()
+
+            for _ in range(entries_per_stmt):
+                Ntry = etree.SubElement(Stmt, 'Ntry')
+                etree.SubElement(Ntry, 'NtryRef').text = uuid.uuid4().hex
+                Amt = etree.SubElement(Ntry, 'Amt', Ccy=random_currency())
+                Amt.text = random_decimal()
+                etree.SubElement(Ntry, 'CdtDbtInd').text = _choice(CRDT_DBIT)
+                etree.SubElement(Ntry, 'RvslInd').text = _choice(BOOLEANS)
+                etree.SubElement(Ntry, 'Sts').text = _choice(STATUSES)
+                BookgDt = etree.SubElement(Ntry, 'BookgDt')
+                etree.SubElement(BookgDt, 'DtTm').text = random_datetime()
+                ValDt = etree.SubElement(Ntry, 'ValDt')
+                etree.SubElement(ValDt, 'Dt').text = random_date()
+
+                # Placeholders for optional anyType fields
+                if _choice(COIN_FLIP):
+                    etree.SubElement(Ntry, 'BkTxCd')
+                if _choice(COIN_FLIP):
+                    etree.SubElement(Ntry, 'NtryDtls')
+
+            write_block(xf, Stmt)
+
+    return filename
 
 # Configurable run
 NUMBER_OF_FILES = 1
 ENTRIES_PER_FILE = 1
 
-for i in range(1, NUMBER_OF_FILES + 1):
-    create_camt053_001_02_xml(i, entries_per_stmt=ENTRIES_PER_FILE)
+if __name__ == '__main__':
+    # Files are independent, so they are generated in parallel worker processes
+    with ProcessPoolExecutor(initializer=seed_worker) as executor:
+        generated = list(executor.map(partial(create_camt053_001_02_xml, entries_per_stmt=ENTRIES_PER_FILE),
+                                      range(1, NUMBER_OF_FILES + 1), chunksize=32))
+    # Per-file names only at DEBUG; the console gets a single summary line
+    for filename in generated:
+        log.debug('Generated file: %s', filename)
+    print(f'Generated {len(generated)} files in {OUTPUT_DIR}')
@@ -1,50 +1,79 @@
 import random
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
+import numpy as np
 from lxml import etree
 
+# One shared random.Random instance, with its hot methods bound once at import
+_prng = random.Random()
+_random = _prng.random
+_choice = _prng.choice
+_randint = _prng.randint
+
+CURRENCIES = ("EUR", "USD", "GBP", "INR", "JPY", "CHF")
+
 def random_date(start_year=2000, end_year=2030):
     start = datetime(start_year, 1, 1)
     end = datetime(end_year, 12, 31)
-    return start + (end - start) * random.random()
+    return start + (end - start) * _random()
+
+random_currency = partial(_choice, CURRENCIES)
+
+# Random strings and amounts are drawn from NumPy in batches and handed out one at a time
+BATCH_SIZE = 256
+_rng = np.random.default_rng()
+_batches = {}
 
-def random_currency():
-    return random.choice(["EUR", "USD", "GBP", "INR", "JPY", "CHF"])
+def _next_string(alphabet, length):
+    batch = _batches.get((alphabet, length))
+    if not batch:
+        # Index random bytes into the alphabet, decode the whole batch once and slice it up
+        table = np.frombuffer(alphabet, dtype='u1')
+        blob = table[_rng.integers(0, len(table), size=BATCH_SIZE * length)].tobytes().decode('ascii')
+        batch = _batches[(alphabet, length)] = [blob[i:i + length] for i in range(0, len(blob), length)]
+    return batch.pop()
 
 def gen_decimal(min_val=0.01, max_val=10000.00):
-    return round(random.uniform(min_val, max_val), 2)
+    batch = _batches.get((min_val, max_val))
+    if not batch:
+        batch = _batches[(min_val, max_val)] = np.round(_rng.uniform(min_val, max_val, BATCH_SIZE), 2).tolist()
+    return batch.pop()
 
 def gen_string(length=10):
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', length)
 
 def gen_iban():
-    return "DE" + ''.join(random.choices("0123456789", k=20))
+    return "DE" + _next_string(b"0123456789", 20)
 
 def gen_bic():
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=8))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 8)
 
 NSMAP = {
     None: "urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"
 }
 
 def generate_xml():
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    today_iso = now.date().isoformat()
     doc = etree.Element("Document", nsmap=NSMAP)
     stmt = etree.SubElement(doc, "BkToCstmrStmt")
 
     # GrpHdr
     grp_hdr = etree.SubElement(stmt, "GrpHdr")
-    etree.SubElement(grp_hdr, "MsgId").text = str(random.randint(10000, 999999))
-    etree.SubElement(grp_hdr, "CreDtTm").text = datetime.utcnow().isoformat()
+    etree.SubElement(grp_hdr, "MsgId").text = str(_randint(10000, 999999))
+    etree.SubElement(grp_hdr, "CreDtTm").text = now_iso
     msg_rcpt = etree.SubElement(grp_hdr, "MsgRcpt")
     etree.SubElement(msg_rcpt, "Nm").text = "ReceiverName"
     etree.SubElement(etree.SubElement(etree.SubElement(etree.SubElement(msg_rcpt, "Id"), "OrgId"), "Othr"), "Id").text = str(uuid.uuid4())
 
     # Stmt
     stmt_elem = etree.SubElement(stmt, "Stmt")
-    etree.SubElement(stmt_elem, "Id").text = str(random.randint(10000, 999999))
-    etree.SubElement(stmt_elem, "ElctrncSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt_elem, "LglSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt_elem, "CreDtTm").text = datetime.utcnow().isoformat()
+    etree.SubElement(stmt_elem, "Id").text = str(_randint(10000, 999999))
+    etree.SubElement(stmt_elem, "ElctrncSeqNb").text = str(_randint(1, 100))
+    etree.SubElement(stmt_elem, "LglSeqNb").text = str(_randint(1, 100))
+    etree.SubElement(stmt_elem, "CreDtTm").text = now_iso
 
     fr_to_dt = etree.SubElement(stmt_elem, "FrToDt")
     fr_date = random_date()
@@ -68,9 +97,9 @@ def generate_xml():
         etree.SubElement(cd, "Cd").text = "CLBD"
         amt = etree.SubElement(bal, "Amt", Ccy=random_currency())
         amt.text = str(gen_decimal())
-        etree.SubElement(bal, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
+        etree.SubElement(bal, "CdtDbtInd").text = _choice(("CRDT", "DBIT"))
         dt = etree.SubElement(bal, "Dt")
-        etree.SubElement(dt, "DtTm").text = datetime.utcnow().isoformat()
+        etree.SubElement(dt, "DtTm").text = now_iso
 
     # TxsSummry
     txs = etree.SubElement(stmt_elem, "TxsSummry")
@@ -87,13 +116,13 @@ def generate_xml():
 
     # Ntry
     entry = etree.SubElement(stmt_elem, "Ntry")
-    etree.SubElement(entry, "NtryRef").text = str(random.randint(100000, 999999))
+    etree.SubElement(entry, "NtryRef").text = str(_randint(100000, 999999))
     etree.SubElement(entry, "Amt", Ccy=random_currency()).text = str(gen_decimal())
-    etree.SubElement(entry, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
+    etree.SubElement(entry, "CdtDbtInd").text = _choice(("CRDT", "DBIT"))
     etree.SubElement(entry, "RvslInd").text = "false"
     etree.SubElement(etree.SubElement(entry, "Sts"), "Cd").text = "BOOK"
-    etree.SubElement(etree.SubElement(entry, "BookgDt"), "DtTm").text = datetime.utcnow().isoformat()
-    etree.SubElement(etree.SubElement(entry, "ValDt"), "Dt").text = datetime.utcnow().date().isoformat()
+    etree.SubElement(etree.SubElement(entry, "BookgDt"), "DtTm").text = now_iso
+    etree.SubElement(etree.SubElement(entry, "ValDt"), "Dt").text = today_iso
 
     bk_tx_cd = etree.SubElement(entry, "BkTxCd")
     domn = etree.SubElement(bk_tx_cd, "Domn")
@@ -138,7 +167,7 @@ def generate_xml():
     etree.SubElement(tp, "Issr").text = "ISO"
     etree.SubElement(ref_inf, "Ref").text = gen_string(10)
 
-    etree.SubElement(etree.SubElement(tx_dtls, "RltdDts"), "IntrBkSttlmDt").text = datetime.utcnow().date().isoformat()
+    etree.SubElement(etree.SubElement(tx_dtls, "RltdDts"), "IntrBkSttlmDt").text = today_iso
     etree.SubElement(tx_dtls, "AddtlTxInf").text = "Additional info goes here"
 
     return etree.tostring(doc, pretty_print=True, xml_declaration=True, encoding="UTF-8")
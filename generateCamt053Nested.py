@@ -1,136 +1,191 @@
+import copy
 import random
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
+from functools import partial
+import numpy as np
 from lxml import etree
+from lxml.builder import ElementMaker
 
 # ---------------------- Utility Functions ----------------------
 
+# One shared random.Random instance, with its hot methods bound once at import
+_prng = random.Random()
+_random = _prng.random
+_choice = _prng.choice
+_randint = _prng.randint
+
+CURRENCIES = ("EUR", "USD", "GBP", "INR", "JPY", "CHF")
+
 def random_date(start_year=2000, end_year=2030):
     start = datetime(start_year, 1, 1)
     end = datetime(end_year, 12, 31)
-    return start + (end - start) * random.random()
+    return start + (end - start) * _random()
+
+random_currency = partial(_choice, CURRENCIES)
+
+# Random strings and amounts are drawn from NumPy in batches and handed out one at a time
+BATCH_SIZE = 256
+_rng = np.random.default_rng()
+_batches = {}
 
-def random_currency():
-    return random.choice(["EUR", "USD", "GBP", "INR", "JPY", "CHF"])
+def _next_string(alphabet, length):
+    batch = _batches.get((alphabet, length))
+    if not batch:
+        # Index random bytes into the alphabet, decode the whole batch once and slice it up
+        table = np.frombuffer(alphabet, dtype='u1')
+        blob = table[_rng.integers(0, len(table), size=BATCH_SIZE * length)].tobytes().decode('ascii')
+        batch = _batches[(alphabet, length)] = [blob[i:i + length] for i in range(0, len(blob), length)]
+    return batch.pop()
 
 def gen_decimal(min_val=0.01, max_val=10000.00):
-    return round(random.uniform(min_val, max_val), 2)
+    batch = _batches.get((min_val, max_val))
+    if not batch:
+        batch = _batches[(min_val, max_val)] = np.round(_rng.uniform(min_val, max_val, BATCH_SIZE), 2).tolist()
+    return batch.pop()
 
 def gen_string(length=10):
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', length)
 
 def gen_iban():
-    return "DE" + ''.join(random.choices("0123456789", k=20))
+    return "DE" + _next_string(b"0123456789", 20)
 
 def gen_bic():
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=8))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 8)
 
 NSMAP = {None: "urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"}
 
+# Builder for the (un-prefixed) child elements; the namespace is declared once on Document
+E = ElementMaker()
+
 # ---------------------- Element Generators ----------------------
 
 def create_grp_hdr():
-    grp_hdr = etree.Element("GrpHdr")
-    etree.SubElement(grp_hdr, "MsgId").text = str(random.randint(10000, 999999))
-    etree.SubElement(grp_hdr, "CreDtTm").text = datetime.utcnow().isoformat()
-    msg_rcpt = etree.SubElement(grp_hdr, "MsgRcpt")
-    etree.SubElement(msg_rcpt, "Nm").text = "ReceiverName"
-    etree.SubElement(etree.SubElement(etree.SubElement(etree.SubElement(msg_rcpt, "Id"), "OrgId"), "Othr"), "Id").text = str(uuid.uuid4())
-    return grp_hdr
+    return E.GrpHdr(
+        E.MsgId(str(_randint(10000, 999999))),
+        E.CreDtTm(datetime.utcnow().isoformat()),
+        E.MsgRcpt(
+            E.Nm("ReceiverName"),
+            E.Id(E.OrgId(E.Othr(E.Id(str(uuid.uuid4()))))),
+        ),
+    )
 
 def create_stmt():
-    stmt = etree.Element("Stmt")
-    etree.SubElement(stmt, "Id").text = str(random.randint(10000, 999999))
-    etree.SubElement(stmt, "ElctrncSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt, "LglSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt, "CreDtTm").text = datetime.utcnow().isoformat()
-
-    fr_to_dt = etree.SubElement(stmt, "FrToDt")
     fr_date = random_date()
     to_date = fr_date + timedelta(days=10)
-    etree.SubElement(fr_to_dt, "FrDtTm").text = fr_date.isoformat()
-    etree.SubElement(fr_to_dt, "ToDtTm").text = to_date.isoformat()
-
-    acct = etree.SubElement(stmt, "Acct")
-    etree.SubElement(etree.SubElement(acct, "Id"), "IBAN").text = gen_iban()
-    etree.SubElement(etree.SubElement(acct, "Tp"), "Prtry").text = "Current"
-    etree.SubElement(acct, "Ccy").text = random_currency()
-    etree.SubElement(acct, "Nm").text = "AccountHolder"
-    fin_inst = etree.SubElement(etree.SubElement(acct, "Svcr"), "FinInstnId")
-    etree.SubElement(fin_inst, "BICFI").text = gen_bic()
-    etree.SubElement(fin_inst, "Nm").text = "BankName"
-
-    return stmt
+    return E.Stmt(
+        E.Id(str(_randint(10000, 999999))),
+        E.ElctrncSeqNb(str(_randint(1, 100))),
+        E.LglSeqNb(str(_randint(1, 100))),
+        E.CreDtTm(datetime.utcnow().isoformat()),
+        E.FrToDt(
+            E.FrDtTm(fr_date.isoformat()),
+            E.ToDtTm(to_date.isoformat()),
+        ),
+        E.Acct(
+            E.Id(E.IBAN(gen_iban())),
+            E.Tp(E.Prtry("Current")),
+            E.Ccy(random_currency()),
+            E.Nm("AccountHolder"),
+            E.Svcr(E.FinInstnId(
+                E.BICFI(gen_bic()),
+                E.Nm("BankName"),
+            )),
+        ),
+    )
 
 def create_bal():
-    bal = etree.Element("Bal")
-    tp = etree.SubElement(bal, "Tp")
-    cd = etree.SubElement(tp, "CdOrPrtry")
-    etree.SubElement(cd, "Cd").text = "CLBD"
-    amt = etree.SubElement(bal, "Amt", Ccy=random_currency())
-    amt.text = str(gen_decimal())
-    etree.SubElement(bal, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
-    dt = etree.SubElement(bal, "Dt")
-    etree.SubElement(dt, "DtTm").text = datetime.utcnow().isoformat()
-    return bal
-
-def create_ntry():
-    ntry = etree.Element("Ntry")
-    etree.SubElement(ntry, "NtryRef").text = str(random.randint(100000, 999999))
-    etree.SubElement(ntry, "Amt", Ccy=random_currency()).text = str(gen_decimal())
-    etree.SubElement(ntry, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
-    etree.SubElement(ntry, "RvslInd").text = "false"
-    etree.SubElement(etree.SubElement(ntry, "Sts"), "Cd").text = "BOOK"
-    etree.SubElement(etree.SubElement(ntry, "BookgDt"), "DtTm").text = datetime.utcnow().isoformat()
-    etree.SubElement(etree.SubElement(ntry, "ValDt"), "Dt").text = datetime.utcnow().date().isoformat()
+    return E.Bal(
+        E.Tp(E.CdOrPrtry(E.Cd("CLBD"))),
+        E.Amt(str(gen_decimal()), Ccy=random_currency()),
+        E.CdtDbtInd(_choice(("CRDT", "DBIT"))),
+        E.Dt(E.DtTm(datetime.utcnow().isoformat())),
+    )
+
+# Static Ntry skeleton, built once; create_ntry deep-copies it and fills in only the per-entry leaves
+_NTRY_TEMPLATE = E.Ntry(
+    E.NtryRef(),
+    E.Amt(),
+    E.CdtDbtInd(),
+    E.RvslInd("false"),
+    E.Sts(E.Cd("BOOK")),
+    E.BookgDt(E.DtTm()),
+    E.ValDt(E.Dt()),
 
     # BkTxCd
-    bk_tx_cd = etree.SubElement(ntry, "BkTxCd")
-    domn = etree.SubElement(bk_tx_cd, "Domn")
-    etree.SubElement(domn, "Cd").text = "PMNT"
-    fmly = etree.SubElement(domn, "Fmly")
-    etree.SubElement(fmly, "Cd").text = "ICDT"
-    etree.SubElement(fmly, "SubFmlyCd").text = "DMCT"
-    prtry = etree.SubElement(bk_tx_cd, "Prtry")
-    etree.SubElement(prtry, "Cd").text = "XYZ123"
+    E.BkTxCd(
+        E.Domn(
+            E.Cd("PMNT"),
+            E.Fmly(
+                E.Cd("ICDT"),
+                E.SubFmlyCd("DMCT"),
+            ),
+        ),
+        E.Prtry(E.Cd("XYZ123")),
+    ),
 
     # NtryDtls
-    ntry_dtls = etree.SubElement(ntry, "NtryDtls")
-    tx_dtls = etree.SubElement(ntry_dtls, "TxDtls")
-    refs = etree.SubElement(tx_dtls, "Refs")
-    etree.SubElement(refs, "AcctSvcrRef").text = gen_string(12)
-    etree.SubElement(refs, "PmtInfId").text = gen_string(12)
-    etree.SubElement(refs, "EndToEndId").text = gen_string(12)
-    etree.SubElement(refs, "TxId").text = gen_string(12)
-
-    amt_dtls = etree.SubElement(tx_dtls, "AmtDtls")
-    for tag in ["InstdAmt", "TxAmt"]:
-        tag_elem = etree.SubElement(amt_dtls, tag)
-        amt = etree.SubElement(tag_elem, "Amt", Ccy=random_currency())
-        amt.text = str(gen_decimal())
-
-    parties = etree.SubElement(tx_dtls, "RltdPties")
-    etree.SubElement(etree.SubElement(etree.SubElement(parties, "Cdtr"), "Pty"), "Nm").text = "CreditorName"
-    etree.SubElement(etree.SubElement(etree.SubElement(parties, "Dbtr"), "Pty"), "Nm").text = "DebtorName"
-    dbtr_acct = etree.SubElement(parties, "DbtrAcct")
-    etree.SubElement(etree.SubElement(dbtr_acct, "Id"), "IBAN").text = gen_iban()
-    etree.SubElement(dbtr_acct, "Nm").text = "DebtorAccount"
-
-    agts = etree.SubElement(tx_dtls, "RltdAgts")
-    etree.SubElement(etree.SubElement(etree.SubElement(agts, "CdtrAgt"), "FinInstnId"), "BICFI").text = gen_bic()
-    etree.SubElement(etree.SubElement(etree.SubElement(agts, "DbtrAgt"), "FinInstnId"), "BICFI").text = gen_bic()
-
-    rmt_inf = etree.SubElement(tx_dtls, "RmtInf")
-    etree.SubElement(rmt_inf, "Ustrd").text = "Invoice 12345"
-    strd = etree.SubElement(rmt_inf, "Strd")
-    ref_inf = etree.SubElement(strd, "CdtrRefInf")
-    tp = etree.SubElement(ref_inf, "Tp")
-    etree.SubElement(tp, "Issr").text = "ISO"
-    etree.SubElement(ref_inf, "Ref").text = gen_string(10)
-
-    etree.SubElement(etree.SubElement(tx_dtls, "RltdDts"), "IntrBkSttlmDt").text = datetime.utcnow().date().isoformat()
-    etree.SubElement(tx_dtls, "AddtlTxInf").text = "Payment for invoice"
+    E.NtryDtls(E.TxDtls(
+        E.Refs(
+            E.AcctSvcrRef(),
+            E.PmtInfId(),
+            E.EndToEndId(),
+            E.TxId(),
+        ),
+        E.AmtDtls(
+            E.InstdAmt(E.Amt()),
+            E.TxAmt(E.Amt()),
+        ),
+        E.RltdPties(
+            E.Cdtr(E.Pty(E.Nm("CreditorName"))),
+            E.Dbtr(E.Pty(E.Nm("DebtorName"))),
+            E.DbtrAcct(
+                E.Id(E.IBAN()),
+                E.Nm("DebtorAccount"),
+            ),
+        ),
+        E.RltdAgts(
+            E.CdtrAgt(E.FinInstnId(E.BICFI())),
+            E.DbtrAgt(E.FinInstnId(E.BICFI())),
+        ),
+        E.RmtInf(
+            E.Ustrd("Invoice 12345"),
+            E.Strd(E.CdtrRefInf(
+                E.Tp(E.Issr("ISO")),
+                E.Ref(),
+            )),
+        ),
+        E.RltdDts(E.IntrBkSttlmDt()),
+        E.AddtlTxInf("Payment for invoice"),
+    )),
+)
+
+def set_amount(amt):
+    amt.text = str(gen_decimal())
+    amt.set("Ccy", random_currency())
 
+def create_ntry():
+    now = datetime.utcnow()
+    today_iso = now.date().isoformat()
+
+    ntry = copy.deepcopy(_NTRY_TEMPLATE)
+    ntry.find("NtryRef").text = str(_randint(100000, 999999))
+    set_amount(ntry.find("Amt"))
+    ntry.find("CdtDbtInd").text = _choice(("CRDT", "DBIT"))
+    ntry.find("BookgDt/DtTm").text = now.isoformat()
+    ntry.find("ValDt/Dt").text = today_iso
+
+    tx_dtls = ntry.find("NtryDtls/TxDtls")
+    for ref in tx_dtls.find("Refs"):
+        ref.text = gen_string(12)
+    set_amount(tx_dtls.find("AmtDtls/InstdAmt/Amt"))
+    set_amount(tx_dtls.find("AmtDtls/TxAmt/Amt"))
+    tx_dtls.find("RltdPties/DbtrAcct/Id/IBAN").text = gen_iban()
+    tx_dtls.find("RltdAgts/CdtrAgt/FinInstnId/BICFI").text = gen_bic()
+    tx_dtls.find("RltdAgts/DbtrAgt/FinInstnId/BICFI").text = gen_bic()
+    tx_dtls.find("RmtInf/Strd/CdtrRefInf/Ref").text = gen_string(10)
+    tx_dtls.find("RltdDts/IntrBkSttlmDt").text = today_iso
     return ntry
 
 # ---------------------- Nested Structure Generator ----------------------
@@ -143,17 +198,22 @@ TAG_CREATORS = {
 }
 
 def populate_structure(parent, structure):
-    for tag_name, tag_info in structure.items():
-        count = tag_info.get("count", 1)
-        children = tag_info.get("children", {})
-
-        for _ in range(count):
-            if tag_name not in TAG_CREATORS:
+    # Walk the structure with an explicit stack of (parent, structure) frames instead of recursing per level
+    stack = deque([(parent, structure)])
+    while stack:
+        parent, structure = stack.pop()
+        for tag_name, tag_info in structure.items():
+            count = tag_info.get("count", 1)
+            children = tag_info.get("children", {})
+
+            if count > 0 and tag_name not in TAG_CREATORS:
                 raise ValueError(f"Unsupported tag: {tag_name}")
-            element = TAG_CREATORS[tag_name]()
-            if children:
-                populate_structure(element, children)
-            parent.append(element)
+            create = TAG_CREATORS.get(tag_name)
+            for _ in range(count):
+                element = create()
+                parent.append(element)
+                if children:
+                    stack.append((element, children))
 
 def generate_nested_xml(structure):
     doc = etree.Element("Document", nsmap=NSMAP)
@@ -1,147 +1,182 @@
 import random
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
+import numpy as np
 from lxml import etree
+from lxml.builder import ElementMaker
+
+# One shared random.Random instance, with its hot methods bound once at import
+_prng = random.Random()
+_random = _prng.random
+_choice = _prng.choice
+_randint = _prng.randint
+
+CURRENCIES = ("EUR", "USD", "GBP", "INR", "JPY", "CHF")
 
 def random_date(start_year=2000, end_year=2030):
     start = datetime(start_year, 1, 1)
     end = datetime(end_year, 12, 31)
-    return start + (end - start) * random.random()
+    return start + (end - start) * _random()
+
+random_currency = partial(_choice, CURRENCIES)
 
-def random_currency():
-    return random.choice(["EUR", "USD", "GBP", "INR", "JPY", "CHF"])
+# Random strings and amounts are drawn from NumPy in batches and handed out one at a time
+BATCH_SIZE = 256
+_rng = np.random.default_rng()
+_batches = {}
+
+def _next_string(alphabet, length):
+    batch = _batches.get((alphabet, length))
+    if not batch:
+        # Index random bytes into the alphabet, decode the whole batch once and slice it up
+        table = np.frombuffer(alphabet, dtype='u1')
+        blob = table[_rng.integers(0, len(table), size=BATCH_SIZE * length)].tobytes().decode('ascii')
+        batch = _batches[(alphabet, length)] = [blob[i:i + length] for i in range(0, len(blob), length)]
+    return batch.pop()
 
 def gen_decimal(min_val=0.01, max_val=10000.00):
-    return round(random.uniform(min_val, max_val), 2)
+    batch = _batches.get((min_val, max_val))
+    if not batch:
+        batch = _batches[(min_val, max_val)] = np.round(_rng.uniform(min_val, max_val, BATCH_SIZE), 2).tolist()
+    return batch.pop()
 
 def gen_string(length=10):
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', length)
 
 def gen_iban():
-    return "DE" + ''.join(random.choices("0123456789", k=20))
+    return "DE" + _next_string(b"0123456789", 20)
 
 def gen_bic():
-    return ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=8))
+    return _next_string(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 8)
 
 NSMAP = {
     None: "urn:iso:std:iso:20022:tech:xsd:camt.053.001.08"
 }
 
-def create_statement():
-    stmt_elem = etree.Element("Stmt")
-    etree.SubElement(stmt_elem, "Id").text = str(random.randint(10000, 999999))
-    etree.SubElement(stmt_elem, "ElctrncSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt_elem, "LglSeqNb").text = str(random.randint(1, 100))
-    etree.SubElement(stmt_elem, "CreDtTm").text = datetime.utcnow().isoformat()
+# Builder for the (un-prefixed) child elements; the namespace is declared once on Document
+E = ElementMaker()
 
-    fr_to_dt = etree.SubElement(stmt_elem, "FrToDt")
+def create_statement():
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    today_iso = now.date().isoformat()
     fr_date = random_date()
     to_date = fr_date + timedelta(days=10)
-    etree.SubElement(fr_to_dt, "FrDtTm").text = fr_date.isoformat()
-    etree.SubElement(fr_to_dt, "ToDtTm").text = to_date.isoformat()
-
-    acct = etree.SubElement(stmt_elem, "Acct")
-    etree.SubElement(etree.SubElement(acct, "Id"), "IBAN").text = gen_iban()
-    etree.SubElement(etree.SubElement(acct, "Tp"), "Prtry").text = "Current"
-    etree.SubElement(acct, "Ccy").text = random_currency()
-    etree.SubElement(acct, "Nm").text = "AccountHolder"
-    fin_inst = etree.SubElement(etree.SubElement(acct, "Svcr"), "FinInstnId")
-    etree.SubElement(fin_inst, "BICFI").text = gen_bic()
-    etree.SubElement(fin_inst, "Nm").text = "BankName"
-
-    # Balances
-    for _ in range(2):
-        bal = etree.SubElement(stmt_elem, "Bal")
-        cd = etree.SubElement(etree.SubElement(bal, "Tp"), "CdOrPrtry")
-        etree.SubElement(cd, "Cd").text = "CLBD"
-        amt = etree.SubElement(bal, "Amt", Ccy=random_currency())
-        amt.text = str(gen_decimal())
-        etree.SubElement(bal, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
-        dt = etree.SubElement(bal, "Dt")
-        etree.SubElement(dt, "DtTm").text = datetime.utcnow().isoformat()
-
-    # TxsSummry
-    txs = etree.SubElement(stmt_elem, "TxsSummry")
-    total_entries = etree.SubElement(txs, "TtlNtries")
-    etree.SubElement(total_entries, "NbOfNtries").text = "5"
-    etree.SubElement(total_entries, "Sum").text = str(gen_decimal())
-    net = etree.SubElement(total_entries, "TtlNetNtry")
-    etree.SubElement(net, "Amt").text = str(gen_decimal())
-    etree.SubElement(net, "CdtDbtInd").text = "CRDT"
-    for tag in ["TtlCdtNtries", "TtlDbtNtries"]:
-        t = etree.SubElement(txs, tag)
-        etree.SubElement(t, "NbOfNtries").text = "3"
-        etree.SubElement(t, "Sum").text = str(gen_decimal())
-
-    # Ntry
-    entry = etree.SubElement(stmt_elem, "Ntry")
-    etree.SubElement(entry, "NtryRef").text = str(random.randint(100000, 999999))
-    etree.SubElement(entry, "Amt", Ccy=random_currency()).text = str(gen_decimal())
-    etree.SubElement(entry, "CdtDbtInd").text = random.choice(["CRDT", "DBIT"])
-    etree.SubElement(entry, "RvslInd").text = "false"
-    etree.SubElement(etree.SubElement(entry, "Sts"), "Cd").text = "BOOK"
-    etree.SubElement(etree.SubElement(entry, "BookgDt"), "DtTm").text = datetime.utcnow().isoformat()
-    etree.SubElement(etree.SubElement(entry, "ValDt"), "Dt").text = datetime.utcnow().date().isoformat()
-
-    bk_tx_cd = etree.SubElement(entry, "BkTxCd")
-    domn = etree.SubElement(bk_tx_cd, "Domn")
-    etree.SubElement(domn, "Cd").text = "PMNT"
-    fmly = etree.SubElement(domn, "Fmly")
-    etree.SubElement(fmly, "Cd").text = "ICDT"
-    etree.SubElement(fmly, "SubFmlyCd").text = "DMCT"
-    prtry = etree.SubElement(bk_tx_cd, "Prtry")
-    etree.SubElement(prtry, "Cd").text = "XYZ123"
-
-    # Entry Details
-    ntry_dtls = etree.SubElement(entry, "NtryDtls")
-    tx_dtls = etree.SubElement(ntry_dtls, "TxDtls")
-    refs = etree.SubElement(tx_dtls, "Refs")
-    etree.SubElement(refs, "AcctSvcrRef").text = gen_string(12)
-    etree.SubElement(refs, "PmtInfId").text = gen_string(12)
-    etree.SubElement(refs, "EndToEndId").text = gen_string(12)
-    etree.SubElement(refs, "TxId").text = gen_string(12)
-
-    amt_dtls = etree.SubElement(tx_dtls, "AmtDtls")
-    for tag in ["InstdAmt", "TxAmt"]:
-        tag_elem = etree.SubElement(amt_dtls, tag)
-        amt = etree.SubElement(tag_elem, "Amt", Ccy=random_currency())
-        amt.text = str(gen_decimal())
-
-    parties = etree.SubElement(tx_dtls, "RltdPties")
-    etree.SubElement(etree.SubElement(etree.SubElement(parties, "Cdtr"), "Pty"), "Nm").text = "CreditorName"
-    etree.SubElement(etree.SubElement(etree.SubElement(parties, "Dbtr"), "Pty"), "Nm").text = "DebtorName"
-    dbtr_acct = etree.SubElement(parties, "DbtrAcct")
-    etree.SubElement(etree.SubElement(dbtr_acct, "Id"), "IBAN").text = gen_iban()
-    etree.SubElement(dbtr_acct, "Nm").text = "DebtorAccount"
-
-    agts = etree.SubElement(tx_dtls, "RltdAgts")
-    etree.SubElement(etree.SubElement(etree.SubElement(agts, "CdtrAgt"), "FinInstnId"), "BICFI").text = gen_bic()
-    etree.SubElement(etree.SubElement(etree.SubElement(agts, "DbtrAgt"), "FinInstnId"), "BICFI").text = gen_bic()
-
-    rmt_inf = etree.SubElement(tx_dtls, "RmtInf")
-    etree.SubElement(rmt_inf, "Ustrd").text = "Invoice 12345"
-    strd = etree.SubElement(rmt_inf, "Strd")
-    ref_inf = etree.SubElement(strd, "CdtrRefInf")
-    tp = etree.SubElement(ref_inf, "Tp")
-    etree.SubElement(tp, "Issr").text = "ISO"
-    etree.SubElement(ref_inf, "Ref").text = gen_string(10)
-
-    etree.SubElement(etree.SubElement(tx_dtls, "RltdDts"), "IntrBkSttlmDt").text = datetime.utcnow().date().isoformat()
-    etree.SubElement(tx_dtls, "AddtlTxInf").text = "Additional info goes here"
-
-    return stmt_elem
+    return E.Stmt(
+        E.Id(str(_randint(10000, 999999))),
+        E.ElctrncSeqNb(str(_randint(1, 100))),
+        E.LglSeqNb(str(_randint(1, 100))),
+        E.CreDtTm(now_iso),
+        E.FrToDt(
+            E.FrDtTm(fr_date.isoformat()),
+            E.ToDtTm(to_date.isoformat()),
+        ),
+        E.Acct(
+            E.Id(E.IBAN(gen_iban())),
+            E.Tp(E.Prtry("Current")),
+            E.Ccy(random_currency()),
+            E.Nm("AccountHolder"),
+            E.Svcr(E.FinInstnId(
+                E.BICFI(gen_bic()),
+                E.Nm("BankName"),
+            )),
+        ),
+
+        # Balances
+        *[E.Bal(
+            E.Tp(E.CdOrPrtry(E.Cd("CLBD"))),
+            E.Amt(str(gen_decimal()), Ccy=random_currency()),
+            E.CdtDbtInd(_choice(("CRDT", "DBIT"))),
+            E.Dt(E.DtTm(now_iso)),
+        ) for _ in range(2)],
+
+        # TxsSummry
+        E.TxsSummry(
+            E.TtlNtries(
+                E.NbOfNtries("5"),
+                E.Sum(str(gen_decimal())),
+                E.TtlNetNtry(
+                    E.Amt(str(gen_decimal())),
+                    E.CdtDbtInd("CRDT"),
+                ),
+            ),
+            *[getattr(E, tag)(
+                E.NbOfNtries("3"),
+                E.Sum(str(gen_decimal())),
+            ) for tag in ["TtlCdtNtries", "TtlDbtNtries"]],
+        ),
+
+        # Ntry
+        E.Ntry(
+            E.NtryRef(str(_randint(100000, 999999))),
+            E.Amt(str(gen_decimal()), Ccy=random_currency()),
+            E.CdtDbtInd(_choice(("CRDT", "DBIT"))),
+            E.RvslInd("false"),
+            E.Sts(E.Cd("BOOK")),
+            E.BookgDt(E.DtTm(now_iso)),
+            E.ValDt(E.Dt(today_iso)),
+            E.BkTxCd(
+                E.Domn(
+                    E.Cd("PMNT"),
+                    E.Fmly(
+                        E.Cd("ICDT"),
+                        E.SubFmlyCd("DMCT"),
+                    ),
+                ),
+                E.Prtry(E.Cd("XYZ123")),
+            ),
+
+            # Entry Details
+            E.NtryDtls(E.TxDtls(
+                E.Refs(
+                    E.AcctSvcrRef(gen_string(12)),
+                    E.PmtInfId(gen_string(12)),
+                    E.EndToEndId(gen_string(12)),
+                    E.TxId(gen_string(12)),
+                ),
+                E.AmtDtls(
+                    E.InstdAmt(E.Amt(str(gen_decimal()), Ccy=random_currency())),
+                    E.TxAmt(E.Amt(str(gen_decimal()), Ccy=random_currency())),
+                ),
+                E.RltdPties(
+                    E.Cdtr(E.Pty(E.Nm("CreditorName"))),
+                    E.Dbtr(E.Pty(E.Nm("DebtorName"))),
+                    E.DbtrAcct(
+                        E.Id(E.IBAN(gen_iban())),
+                        E.Nm("DebtorAccount"),
+                    ),
+                ),
+                E.RltdAgts(
+                    E.CdtrAgt(E.FinInstnId(E.BICFI(gen_bic()))),
+                    E.DbtrAgt(E.FinInstnId(E.BICFI(gen_bic()))),
+                ),
+                E.RmtInf(
+                    E.Ustrd("Invoice 12345"),
+                    E.Strd(E.CdtrRefInf(
+                        E.Tp(E.Issr("ISO")),
+                        E.Ref(gen_string(10)),
+                    )),
+                ),
+                E.RltdDts(E.IntrBkSttlmDt(today_iso)),
+                E.AddtlTxInf("Additional info goes here"),
+            )),
+        ),
+    )
 
 def generate_xml_with_statements(num_statements=1):
     doc = etree.Element("Document", nsmap=NSMAP)
     bk_to_cust_stmt = etree.SubElement(doc, "BkToCstmrStmt")
 
     # Header
-    grp_hdr = etree.SubElement(bk_to_cust_stmt, "GrpHdr")
-    etree.SubElement(grp_hdr, "MsgId").text = str(random.randint(10000, 999999))
-    etree.SubElement(grp_hdr, "CreDtTm").text = datetime.utcnow().isoformat()
-    msg_rcpt = etree.SubElement(grp_hdr, "MsgRcpt")
-    etree.SubElement(msg_rcpt, "Nm").text = "ReceiverName"
-    etree.SubElement(etree.SubElement(etree.SubElement(etree.SubElement(msg_rcpt, "Id"), "OrgId"), "Othr"), "Id").text = str(uuid.uuid4())
+    bk_to_cust_stmt.append(E.GrpHdr(
+        E.MsgId(str(_randint(10000, 999999))),
+        E.CreDtTm(datetime.utcnow().isoformat()),
+        E.MsgRcpt(
+            E.Nm("ReceiverName"),
+            E.Id(E.OrgId(E.Othr(E.Id(str(uuid.uuid4()))))),
+        ),
+    ))
 
     # Add multiple Stmt entries
     for _ in range(num_statements):
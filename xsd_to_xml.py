@@ -1,63 +1,188 @@
 import argparse
+import copy
+import functools
+import itertools
+import os
 from lxml import etree
 import random
 import datetime
+from enum import IntEnum
 
 
 # --- Helper Functions for Sample Data Generation ---
+
+# One private random.Random for all generated data, with its methods bound once at import
+_rng = random.Random()
+_randint = _rng.randint
+_random = _rng.random
+_uniform = _rng.uniform
+_choice = _rng.choice
+_getrandbits = _rng.getrandbits
+_BOOLEANS = ("true", "false")
+
+# str() of small non-negative ints, so most integer samples are a tuple index instead of a str() call
+_INT_STR_CACHE = tuple(str(i) for i in range(1024))
+
+
+def _int_producer(low, high):
+    """Returns a producer of uniform integers in [low, high], drawn with getrandbits."""
+    span = high - low + 1
+    bits = (span - 1).bit_length()
+
+    def draw():
+        # Reject out-of-range draws rather than taking a modulo, which would skew the distribution
+        value = _getrandbits(bits)
+        while value >= span:
+            value = _getrandbits(bits)
+        return low + value
+
+    if 0 <= low and high < len(_INT_STR_CACHE):
+        return lambda times: _INT_STR_CACHE[draw()]
+    return lambda times: str(draw())
+
+
+# strftime formats of the date/time types sampled in local time; xs:dateTime is sampled in UTC
+_LOCAL_TIME_FORMATS = {
+    "time": "%H:%M:%S",
+    "date": "%Y-%m-%d",
+    "gyearmonth": "%Y-%m",
+    "gyear": "%Y",
+    "gmonthday": "--%m-%d",
+    "gday": "---%d",
+    "gmonth": "--%m--",
+}
+_TIME_TYPES = frozenset(("datetime", *_LOCAL_TIME_FORMATS))
+
+
+def _time_string(type_key, now):
+    """Formats the sample value of one date/time type (a _TIME_TYPES key) for the UTC timestamp `now`."""
+    if type_key == "datetime":
+        return now.isoformat(timespec='seconds')  # UTC time
+    return now.astimezone().strftime(_LOCAL_TIME_FORMATS[type_key])
+
+
+def _time_strings(now):
+    """
+    Formats the date/time sample values for the UTC timestamp `now` once, keyed by XSD type name,
+    so every date/time value in a document is a dict lookup.
+    """
+    return {type_key: _time_string(type_key, now) for type_key in _TIME_TYPES}
+
+
+# Sample value producer per built-in XSD type (all lowercase keys). Each takes the document's
+# _time_strings(), which only the date/time producers use; a value is only computed when asked for.
+_VALUE_PRODUCERS = {
+    # Basic XML Schema Built-in Types
+    "string": lambda times: "sample_string",
+    "normalizedstring": lambda times: "sample_normalized_string",
+    "token": lambda times: "sample_token",
+    "boolean": lambda times: _choice(_BOOLEANS),
+    "decimal": lambda times: f"{_uniform(1.0, 1000.0):.2f}",  # Format to 2 decimal places
+    "integer": _int_producer(1, 1000),
+    "long": _int_producer(1000, 100000),
+    "int": _int_producer(1, 1000),
+    "short": _int_producer(1, 100),
+    "byte": _int_producer(0, 127),
+    "nonnegativeinteger": _int_producer(0, 1000),
+    "positiveinteger": _int_producer(1, 1000),
+    "nonpositiveinteger": _int_producer(-1000, 0),
+    "negativeinteger": _int_producer(-1000, -1),
+    "double": lambda times: f"{_uniform(1.0, 1000.0):.4f}",
+    "float": lambda times: f"{_uniform(1.0, 1000.0):.4f}",
+    "duration": lambda times: "P1Y2M3DT4H5M6S",  # Example duration
+    "datetime": lambda times: times["datetime"],
+    "time": lambda times: times["time"],
+    "date": lambda times: times["date"],
+    "gyearmonth": lambda times: times["gyearmonth"],
+    "gyear": lambda times: times["gyear"],
+    "gmonthday": lambda times: times["gmonthday"],
+    "gday": lambda times: times["gday"],
+    "gmonth": lambda times: times["gmonth"],
+    "hexbinary": lambda times: "0FB7",
+    "base64binary": lambda times: "AQIDBA==",
+    "anyuri": lambda times: "http://example.com/resource",
+    "qname": lambda times: "tns:sampleQName",
+    "notation": lambda times: "sample_notation",
+    "id": lambda times: "id" + str(_randint(1000, 9999)),
+    "idref": lambda times: "idref" + str(_randint(1000, 9999)),
+    "idrefs": lambda times: "idrefs_1 idrefs_2",
+    "nmtoken": lambda times: "sample_NMTOKEN",
+    "nmtokens": lambda times: "sample_NMTOKEN_1 sample_NMTOKEN_2",
+    "name": lambda times: "sample_Name",
+    "ncname": lambda times: "sampleNCName",
+    "language": lambda times: "en-US",
+    "entity": lambda times: "entity_name",
+    "entities": lambda times: "entity_name_1 entity_name_2",
+    "notations": lambda times: "notation_1 notation_2",
+    "anysimpletype": lambda times: "any_simple_type_value",  # Generic fallback
+}
+
+# Types whose producer always returns the same value; they compile to a fixed text/attribute value
+_FIXED_VALUE_TYPES = frozenset((
+    "string", "normalizedstring", "token", "duration", "hexbinary", "base64binary", "anyuri", "qname",
+    "notation", "idrefs", "nmtoken", "nmtokens", "name", "ncname", "language", "entity", "entities",
+    "notations", "anysimpletype",
+))
+
+
 def generate_sample_value(xsd_type_name):
     """Generates a sample value based on the XSD data type."""
-    type_map = {
-        # Basic XML Schema Built-in Types (all lowercase keys)
-        "string": "sample_string",
-        "normalizedstring": "sample_normalized_string",
-        "token": "sample_token",
-        "boolean": random.choice(["true", "false"]),
-        "decimal": f"{random.uniform(1.0, 1000.0):.2f}",  # Format to 2 decimal places
-        "integer": str(random.randint(1, 1000)),
-        "long": str(random.randint(1000, 100000)),
-        "int": str(random.randint(1, 1000)),
-        "short": str(random.randint(1, 100)),
-        "byte": str(random.randint(0, 127)),
-        "nonnegativeinteger": str(random.randint(0, 1000)),
-        "positiveinteger": str(random.randint(1, 1000)),
-        "nonpositiveinteger": str(random.randint(-1000, 0)),
-        "negativeinteger": str(random.randint(-1000, -1)),
-        "double": f"{random.uniform(1.0, 1000.0):.4f}",
-        "float": f"{random.uniform(1.0, 1000.0):.4f}",
-        "duration": "P1Y2M3DT4H5M6S",  # Example duration
-        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),  # UTC time
-        "time": datetime.datetime.now().strftime("%H:%M:%S"),
-        "date": datetime.date.today().isoformat(),
-        "gyearmonth": datetime.datetime.now().strftime("%Y-%m"),
-        "gyear": datetime.datetime.now().strftime("%Y"),
-        "gmonthday": datetime.datetime.now().strftime("--%m-%d"),
-        "gday": datetime.datetime.now().strftime("---%d"),
-        "gmonth": datetime.datetime.now().strftime("--%m--"),
-        "hexbinary": "0FB7",
-        "base64binary": "AQIDBA==",
-        "anyuri": "http://example.com/resource",
-        "qname": "tns:sampleQName",
-        "notation": "sample_notation",
-        "id": "id" + str(random.randint(1000, 9999)),
-        "idref": "idref" + str(random.randint(1000, 9999)),
-        "idrefs": "idrefs_1 idrefs_2",
-        "nmtoken": "sample_NMTOKEN",
-        "nmtokens": "sample_NMTOKEN_1 sample_NMTOKEN_2",
-        "name": "sample_Name",
-        "ncname": "sampleNCName",
-        "language": "en-US",
-        "entity": "entity_name",
-        "entities": "entity_name_1 entity_name_2",
-        "notations": "notation_1 notation_2",
-        "anysimpletype": "any_simple_type_value",  # Generic fallback
-    }
     # Convert the input type name to lowercase for consistent lookup
-    return type_map.get(xsd_type_name.lower(), f"UNKNOWN_TYPE_{xsd_type_name}")
+    type_key = xsd_type_name.lower()
+    producer = _VALUE_PRODUCERS.get(type_key)
+    if producer is None:
+        return f"UNKNOWN_TYPE_{xsd_type_name}"
+    if type_key not in _TIME_TYPES:
+        return producer(None)  # Only the date/time producers read the times, so the clock isn't needed
+    return _time_string(type_key, datetime.datetime.now(datetime.timezone.utc))
 
 
 # --- Core XML Generation Logic ---
 
+# Content-model children of a complexType, in the order they are looked for; "group" is an xs:group ref
+CONTENT_MODEL_TAGS = ("sequence", "all", "choice", "group", "complexContent", "simpleContent")
+# Content model of a base type reached through complexContent/extension (no simpleContent there)
+BASE_CONTENT_MODEL_TAGS = ("sequence", "all", "choice", "group", "complexContent")
+# Content model added by a complexContent extension or restriction
+DERIVED_CONTENT_MODEL_TAGS = ("sequence", "group")
+# Content model of a named xs:group
+GROUP_CONTENT_MODEL_TAGS = ("sequence", "all", "choice")
+_NO_CHILDREN = {}
+# Deepest element nesting generated below the root; a required recursive type would otherwise never end
+MAX_DEPTH = 100
+
+
+def _depth_error(qname):
+    """The error raised when generating an element would nest deeper than MAX_DEPTH."""
+    return ValueError(f"Recursive type at element '{etree.QName(qname).localname}' exceeds max depth of {MAX_DEPTH}")
+
+
+class TagCode(IntEnum):
+    """Small-integer codes for the XSD tags the generator branches on."""
+    OTHER = 0
+    SEQUENCE = 1
+    ALL = 2
+    CHOICE = 3
+    COMPLEXCONTENT = 4
+    SIMPLECONTENT = 5
+    SIMPLETYPE = 6
+    ELEMENT = 7
+    GROUP = 8
+
+
+# XSD local name -> TagCode; any other XSD tag is TagCode.OTHER
+_TAG_CODES = {
+    "sequence": TagCode.SEQUENCE,
+    "all": TagCode.ALL,
+    "choice": TagCode.CHOICE,
+    "complexContent": TagCode.COMPLEXCONTENT,
+    "simpleContent": TagCode.SIMPLECONTENT,
+    "simpleType": TagCode.SIMPLETYPE,
+    "element": TagCode.ELEMENT,
+    "group": TagCode.GROUP,
+}
+
+
 class XSDToXMLGenerator:
     """
     Generates an XML instance document based on an XSD schema.
@@ -65,20 +190,47 @@ class XSDToXMLGenerator:
     """
     XSD_NAMESPACE = "{http://www.w3.org/2001/XMLSchema}"
 
-    def __init__(self, xsd_path):
+    def __init__(self, xsd_path, verbose=False):
+        # Warnings about unsupported or incomplete schema constructs are only printed when verbose
+        self.verbose = verbose
         try:
-            self.schema_doc = etree.parse(xsd_path)
-            # etree.XMLSchema handles imports/includes internally when parsing the schema
-            self.xmlschema = etree.XMLSchema(self.schema_doc)
+            # Blank text and comments are never read, so don't build nodes for them
+            parser = etree.XMLParser(collect_ids=False, huge_tree=True, remove_blank_text=True,
+                                     remove_comments=True, resolve_entities=False)
+            self.schema_doc = etree.parse(xsd_path, parser=parser)
+            # The schema is walked once up front; all later lookups go through this index
+            # id(node) -> TagCode for every XSD node, filled by the same walk. The index keeps the
+            # node proxies alive, so their ids stay valid for the generator's lifetime.
+            self._tag_codes = {}
+            self._child_index = self._index_children()
             self.target_namespace = self.schema_doc.getroot().get('targetNamespace')
             # The namespace map for the root element will typically map the default namespace
             # to the targetNamespace of the schema.
             self.namespace_map = {None: self.target_namespace} if self.target_namespace else {}
+            # Element local name -> tag qualified with the target namespace, filled as names are seen
+            self._qname_cache = {}
+            # Compiled generation plans: per <xs:element> definition, and per type (or inline element) content
+            self._element_ops = {}
+            self._plan_cache = {}
+            # id(plan) -> whether every instance it generates is identical (see _plan_is_deterministic)
+            self._deterministic_plans = {}
+            # Date/time sample values shared by a whole document; formatted per generate_xml() call
+            self._times = None
 
             # For complex types defined globally, we need a lookup.
-            # This uses findall() which correctly uses the namespace syntax.
             self.complex_types = self._get_global_definitions("complexType")
             self.simple_types = self._get_global_definitions("simpleType")
+            # Named model groups and attribute groups, resolved when an xs:group/xs:attributeGroup ref is compiled
+            self.groups = self._get_global_definitions("group")
+            self.attribute_groups = self._get_global_definitions("attributeGroup")
+
+            # Type resolution is memoized: the same types are looked up for every element that uses them
+            self._type_def_cache = {}
+            self._type_name_cache = {}
+            # xs:restriction node -> tuple of its enumeration values
+            self._enum_cache = {}
+            for type_name in (*self.complex_types, *self.simple_types):
+                self._get_type_definition(type_name)
 
         except etree.XMLSyntaxError as e:
             raise ValueError(f"Invalid XSD syntax: {e}")
@@ -88,23 +240,93 @@ class XSDToXMLGenerator:
             # Catch any other lxml parsing errors during __init__
             raise Exception(f"Failed to load or parse XSD: {e}")
 
+    def _index_children(self):
+        """
+        Walks the schema once, grouping every node's XSD children by local name (in document order)
+        and recording each node's TagCode.
+        """
+        index = {}
+        tag_codes = self._tag_codes
+        prefix_len = len(self.XSD_NAMESPACE)
+        for _, el in etree.iterwalk(self.schema_doc, events=("start",)):
+            tag = el.tag
+            if not isinstance(tag, str) or not tag.startswith(self.XSD_NAMESPACE):
+                continue  # Comments, processing instructions and non-XSD content (e.g. appinfo)
+            local_name = tag[prefix_len:]
+            tag_codes[id(el)] = _TAG_CODES.get(local_name, TagCode.OTHER)
+            parent = el.getparent()
+            if parent is not None:
+                index.setdefault(parent, {}).setdefault(local_name, []).append(el)
+        return index
+
+    def _children(self, xsd_node, local_name):
+        """Returns the XSD children of `xsd_node` with the given local name."""
+        return self._child_index.get(xsd_node, _NO_CHILDREN).get(local_name, ())
+
+    def _child(self, xsd_node, local_name):
+        """Returns the first XSD child of `xsd_node` with the given local name, or None."""
+        children = self._children(xsd_node, local_name)
+        return children[0] if children else None
+
+    def _content_model(self, type_def, tags=CONTENT_MODEL_TAGS):
+        """Returns the content model child (sequence, all, choice, ...) of a complexType, or None."""
+        for tag in tags:
+            child = self._child(type_def, tag)
+            if child is not None:
+                return child
+        return None
+
     def _get_global_definitions(self, tag_name):
-        """Helper to get global complexType or simpleType definitions."""
+        """Helper to get global named definitions (complexType, simpleType, group, attributeGroup) by name."""
         definitions = {}
-        # Use findall with the correct namespace prefix for robust parsing
-        for definition in self.schema_doc.getroot().findall(f"{self.XSD_NAMESPACE}{tag_name}"):
+        for definition in self._children(self.schema_doc.getroot(), tag_name):
             name = definition.get("name")
             if name:
                 definitions[name] = definition
         return definitions
 
+    @functools.cached_property
+    def xmlschema(self):
+        """The compiled etree.XMLSchema, built on first use; generation itself never needs it."""
+        try:
+            # etree.XMLSchema handles imports/includes internally when parsing the schema
+            return etree.XMLSchema(self.schema_doc)
+        except etree.XMLSchemaParseError as e:
+            raise ValueError(f"Invalid XSD schema: {e}")
+
+    def validate(self, xml_source):
+        """
+        Validates a generated document against the schema. `xml_source` is the document as bytes
+        (as returned by generate_xml()) or the path of an XML file. Returns the list of validation
+        error messages, empty if the document is valid.
+        """
+        if isinstance(xml_source, bytes):
+            xml_doc = etree.fromstring(xml_source)
+        else:
+            xml_doc = etree.parse(xml_source)
+        if self.xmlschema.validate(xml_doc):
+            return []
+        return [str(error) for error in self.xmlschema.error_log]
+
+    def _warn(self, message):
+        """Prints a warning about the schema, if the generator is verbose."""
+        if self.verbose:
+            print(f"Warning: {message}")
+
     def _get_type_definition(self, type_name):
-        """Resolves a type name to its XSD definition (complex or simple)."""
+        """Resolves a type name to its XSD definition (complex or simple), cached per name."""
+        try:
+            return self._type_def_cache[type_name]
+        except KeyError:
+            type_def = self._type_def_cache[type_name] = self._resolve_type_definition(type_name)
+            return type_def
+
+    def _resolve_type_definition(self, type_name):
         if type_name is None:
             return None  # No explicit type defined
 
         # Check if it's a built-in XSD type (starts with xs:)
-        if type_name.startswith("xs:"):
+        if type_name[:3] == "xs:":
             return None  # No specific definition needed for built-in types, handle by name
 
         # Check if it's a custom type defined in the current schema's global definitions
@@ -124,6 +346,23 @@ class XSDToXMLGenerator:
         return None  # Fallback to handling by name as a simple type
 
     def _get_xsd_type_name(self, xsd_element):
+        """Returns the effective XSD type name for an element or attribute, cached per schema node."""
+        try:
+            return self._type_name_cache[xsd_element]
+        except KeyError:
+            type_name = self._type_name_cache[xsd_element] = self._resolve_xsd_type_name(xsd_element)
+            return type_name
+
+    def _enum_values(self, restriction):
+        """Returns the enumeration values of an xs:restriction as a tuple (empty if none), cached per node."""
+        try:
+            return self._enum_cache[restriction]
+        except KeyError:
+            values = self._enum_cache[restriction] = tuple(
+                e.get("value") for e in self._children(restriction, "enumeration"))
+            return values
+
+    def _resolve_xsd_type_name(self, xsd_element):
         """
         Determines the effective XSD type name for an element or attribute.
         Handles direct type attributes, references, and inline complexType/simpleType definitions.
@@ -131,11 +370,11 @@ class XSDToXMLGenerator:
         # Direct type attribute (e.g., <xs:element name="age" type="xs:int"/>)
         type_attr = xsd_element.get("type")
         if type_attr:
-            if type_attr.startswith("xs:"):
-                return type_attr.split(":")[1]  # Return 'int', 'string' etc.
+            if type_attr[:3] == "xs:":
+                return type_attr[3:]  # Return 'int', 'string' etc.
             # If it's a custom type like 'tns:MyType', return 'MyType'
             if ":" in type_attr:
-                return type_attr.split(":")[-1]
+                return type_attr[type_attr.find(":") + 1:]
             return type_attr  # Custom type name
 
         # Check for reference to a global element or attribute
@@ -148,38 +387,46 @@ class XSDToXMLGenerator:
             return "string"  # Fallback for referenced elements/attributes without explicit type
 
         # Inline complexType/simpleType definition
-        complex_type_def = xsd_element.find(f"{self.XSD_NAMESPACE}complexType")
+        complex_type_def = self._child(xsd_element, "complexType")
         if complex_type_def is not None:
             # Check for simpleContent within inline complexType
-            simple_content_def = complex_type_def.find(f"{self.XSD_NAMESPACE}simpleContent")
+            simple_content_def = self._child(complex_type_def, "simpleContent")
             if simple_content_def is not None:
-                extension_def = simple_content_def.find(f"{self.XSD_NAMESPACE}extension")
+                extension_def = self._child(simple_content_def, "extension")
                 if extension_def is not None:
                     base_type = extension_def.get("base")
-                    if base_type and base_type.startswith("xs:"):
-                        return base_type.split(":")[1]
+                    if base_type and base_type[:3] == "xs:":
+                        return base_type[3:]
                     # If base is a custom type, return its name. Otherwise, default.
                     if ":" in base_type:
-                        return base_type.split(":")[-1]
+                        return base_type[base_type.find(":") + 1:]
                     return base_type if base_type else "string"  # Fallback if base not xs: type
             return None  # Inline complex type, not a named type we can map directly
 
-        simple_type_def = xsd_element.find(f"{self.XSD_NAMESPACE}simpleType")
+        simple_type_def = self._child(xsd_element, "simpleType")
         if simple_type_def is not None:
-            restriction = simple_type_def.find(f"{self.XSD_NAMESPACE}restriction")
+            restriction = self._child(simple_type_def, "restriction")
             if restriction is not None:
                 base_type = restriction.get("base")
-                if base_type and base_type.startswith("xs:"):
-                    return base_type.split(":")[1]
+                if base_type and base_type[:3] == "xs:":
+                    return base_type[3:]
                 # If base is a custom type, return its name. Otherwise, default.
                 if ":" in base_type:
-                    return base_type.split(":")[-1]
+                    return base_type[base_type.find(":") + 1:]
                 return base_type if base_type else "string"
             return None  # Inline simple type, not a named type we can map directly
 
         # Fallback for elements without explicit type or inline definition (defaults to xs:anyType, often implies string)
         return "string"
 
+    def _qname(self, local_name):
+        """Returns the tag for an element name, qualified with the schema's target namespace if it has one."""
+        qname = self._qname_cache.get(local_name)
+        if qname is None:
+            qname = f"{{{self.target_namespace}}}{local_name}" if self.target_namespace else local_name
+            self._qname_cache[local_name] = qname
+        return qname
+
     def _get_occurrence(self, xsd_node):
         """Gets minOccurs and maxOccurs for an XSD element."""
         min_occurs = int(xsd_node.get("minOccurs", 1))
@@ -187,38 +434,197 @@ class XSDToXMLGenerator:
         max_occurs = float('inf') if max_occurs_str == "unbounded" else int(max_occurs_str)
         return min_occurs, max_occurs
 
-    def _process_content_model(self, parent_xml_element, content_model_element, path=""):
+    def _num_occurrences(self, min_occurs, max_occurs):
+        """Decides how many instances of an element to generate from its minOccurs/maxOccurs."""
+        num_occurrences = 1  # Default to 1 occurrence
+        if max_occurs == float('inf'):
+            # Generate at least min_occurs, up to a small random number for unbounded
+            num_occurrences = _randint(min_occurs, min(min_occurs + 1, 2))
+            if num_occurrences == 0 and min_occurs == 0:  # Ensure at least one if minOccurs=0 but maxOccurs=unbounded
+                num_occurrences = 1
+        elif max_occurs > 1:
+            num_occurrences = _randint(min_occurs, max_occurs)
+            if num_occurrences == 0 and min_occurs == 0:  # Ensure at least one if minOccurs=0 but maxOccurs>1
+                num_occurrences = 1
+        elif min_occurs == 0 and _random() < 0.5:  # 50% chance to skip optional elements (minOccurs=0)
+            num_occurrences = 0
+        return num_occurrences
+
+    # --- Plan compilation ---
+    # Each element definition and type is interpreted once into a "plan": a list of ops applied to
+    # every generated instance of it.
+    #   ("child", qname, min_occurs, max_occurs, plan)  generate child elements, each filled from `plan`
+    #   ("attr", name, producer)                        set an attribute to a value from the type's producer
+    #   ("attr_value", name, value)                     set an attribute to a fixed value
+    #   ("text", producer)                              set the text to a value from the type's producer
+    #   ("text_value", value)                           set the text to a fixed value
+    #   ("text_enum", values)                           set the text to one of the enumeration values
+
+    def _text_op(self, xsd_type_name):
+        """Compiles a text op for a type; the value producer is resolved here rather than per instance."""
+        type_key = xsd_type_name.lower()
+        producer = _VALUE_PRODUCERS.get(type_key)
+        if producer is None:
+            return ("text_value", f"UNKNOWN_TYPE_{xsd_type_name}")
+        if type_key in _FIXED_VALUE_TYPES:
+            return ("text_value", producer(None))
+        return ("text", producer)
+
+    def _attr_op(self, attr_name, xsd_type_name):
+        """Compiles an attribute op for a type; the value producer is resolved here rather than per instance."""
+        type_key = xsd_type_name.lower()
+        producer = _VALUE_PRODUCERS.get(type_key)
+        if producer is None:
+            return ("attr_value", attr_name, f"UNKNOWN_TYPE_{xsd_type_name}")
+        if type_key in _FIXED_VALUE_TYPES:
+            return ("attr_value", attr_name, producer(None))
+        return ("attr", attr_name, producer)
+
+    def _compile_element(self, xsd_element_def, current_path=""):
         """
-        Recursively processes complexType content models (sequence, all, choice, complexContent, simpleContent).
-        `content_model_element` can be xs:sequence, xs:all, xs:choice, xs:complexContent, xs:simpleContent.
+        Compiles an <xs:element> definition into a ("child", ...) op, or None if it never generates anything.
+        `xsd_element_def` is an lxml element representing an <xs:element>.
+        """
+        try:
+            return self._element_ops[xsd_element_def]
+        except KeyError:
+            pass
+
+        op = None
+        element_name = xsd_element_def.get("name")
+        if not element_name:
+            self._warn(f"Skipping unnamed element in XSD at {current_path}")
+        else:
+            min_occurs, max_occurs = self._get_occurrence(xsd_element_def)
+            if not (min_occurs == 0 and max_occurs == 0):  # Don't generate if minOccurs=0 and maxOccurs=0
+                plan = self._compile_element_content(xsd_element_def, f"{current_path}/{element_name}")
+                op = ("child", self._qname(element_name), min_occurs, max_occurs, plan)
+        self._element_ops[xsd_element_def] = op
+        return op
+
+    def _compile_element_content(self, xsd_element_def, current_path):
+        """
+        Returns the plan for the attributes and content of one instance of an element.
+        Plans of global types are shared by every element of that type; the plan is cached before it is
+        filled, so a type that (indirectly) contains itself refers back to its own plan.
+        """
+        # --- Determine Element's Type ---
+        xsd_type_name = self._get_xsd_type_name(xsd_element_def)
+        xsd_type_def = self._get_type_definition(xsd_type_name)  # Will be None for built-in or inline types
+
+        plan_key = xsd_type_def if xsd_type_def is not None else xsd_element_def
+        plan = self._plan_cache.get(plan_key)
+        if plan is not None:
+            return plan
+        plan = self._plan_cache[plan_key] = []
+
+        if xsd_type_def is not None:
+            # This element refers to a globally defined complexType or simpleType
+            # Process attributes defined directly on the type definition
+            self._process_attributes(plan, xsd_type_def)
+
+            # Process content model (sequence, all, choice, complexContent, simpleContent) if it's a complex type
+            complex_type_content = self._content_model(xsd_type_def)
+
+            if complex_type_content is not None:
+                self._process_content_model(plan, complex_type_content, current_path)
+            elif self._tag_codes[id(xsd_type_def)] == TagCode.SIMPLETYPE:
+                # If it's a globally defined simple type, generate text content directly
+                restriction = self._child(xsd_type_def, "restriction")
+                if restriction is not None:
+                    base_type = restriction.get("base")
+                    if base_type and base_type[:3] == "xs:":
+                        plan.append(self._text_op(base_type[3:]))
+                    else:
+                        # Handle enums if present
+                        enum_values = self._enum_values(restriction)
+                        if enum_values:
+                            plan.append(("text_enum", enum_values))
+                        else:
+                            plan.append(("text_value", f"SIMPLE_TYPE_NO_BASE_OR_ENUM_{xsd_type_name}"))
+                else:
+                    plan.append(("text_value", f"SIMPLE_TYPE_NO_RESTRICTION_{xsd_type_name}"))
+            else:
+                # Complex type with no explicit content model (e.g., empty complex type or only attributes)
+                pass
+
+        else:
+            # Element has an inline definition or is a built-in type
+            # Process attributes defined directly on the element definition
+            self._process_attributes(plan, xsd_element_def)
+
+            # Check for inline complexType definition
+            inline_complex_type = self._child(xsd_element_def, "complexType")
+            if inline_complex_type is not None:
+                # Process content model of the inline complex type
+                content_model = self._content_model(inline_complex_type)
+                if content_model is not None:
+                    self._process_content_model(plan, content_model, current_path)
+                # Otherwise it's a complex type without sequence/all/choice/simpleContent: empty or attributes only.
+            else:
+                # Element is a simple type (either built-in or inline simpleType)
+                inline_simple_type = self._child(xsd_element_def, "simpleType")
+                if inline_simple_type is not None:
+                    restriction = self._child(inline_simple_type, "restriction")
+                    if restriction is not None:
+                        base_type = restriction.get("base")
+                        if base_type and base_type[:3] == "xs:":
+                            plan.append(self._text_op(base_type[3:]))
+                        else:
+                            enum_values = self._enum_values(restriction)
+                            if enum_values:
+                                plan.append(("text_enum", enum_values))
+                            else:
+                                plan.append(("text_value", "INLINE_SIMPLE_TYPE_NO_BASE_OR_ENUM"))
+                    else:
+                        plan.append(("text_value", "INLINE_SIMPLE_TYPE_NO_RESTRICTION"))
+                else:
+                    # Default to text content for simple elements without inline definitions
+                    plan.append(self._text_op(xsd_type_name))
+
+        return plan
+
+    def _process_content_model(self, plan, content_model_element, path=""):
+        """
+        Recursively compiles complexType content models (sequence, all, choice, complexContent, simpleContent)
+        into `plan`.
+        `content_model_element` can be xs:sequence, xs:all, xs:choice, an xs:group ref, xs:complexContent
+        or xs:simpleContent.
         """
         current_path = path
 
         if content_model_element is None:
             return
 
+        code = self._tag_codes[id(content_model_element)]
         # Handle xs:sequence, xs:all
-        if content_model_element.tag in [f"{self.XSD_NAMESPACE}sequence", f"{self.XSD_NAMESPACE}all"]:
-            for child_xsd_element in content_model_element.findall(f"{self.XSD_NAMESPACE}element"):
-                self._generate_xml_element(parent_xml_element, child_xsd_element, current_path)
-            # Also handle groups if present (xs:group ref="...")
-            for group_ref in content_model_element.findall(f"{self.XSD_NAMESPACE}group"):
-                # This is a simplification. Full group resolution would require looking up global groups.
-                # For now, we'll just log a warning.
-                print(
-                    f"Warning: xs:group reference '{group_ref.get('ref')}' at {current_path} is not fully resolved. Skipping group content.")
-        elif content_model_element.tag == f"{self.XSD_NAMESPACE}choice":
+        if code == TagCode.SEQUENCE or code == TagCode.ALL:
+            # Elements and group references are compiled in document order
+            tag_codes = self._tag_codes
+            for child in content_model_element:
+                child_code = tag_codes.get(id(child))
+                if child_code == TagCode.ELEMENT:
+                    child_op = self._compile_element(child, current_path)
+                    if child_op is not None:
+                        plan.append(child_op)
+                elif child_code == TagCode.GROUP:
+                    self._process_group_ref(plan, child, current_path)
+        elif code == TagCode.CHOICE:
             # For simplicity, pick the first element in a choice
             # You could extend this to randomly pick one or offer user choice
-            first_choice = content_model_element.find(f"{self.XSD_NAMESPACE}element")
+            first_choice = self._child(content_model_element, "element")
             if first_choice is not None:
-                # print(f"Info: Processing first element in xs:choice at {current_path}/{first_choice.get('name')}")
-                self._generate_xml_element(parent_xml_element, first_choice, current_path)
+                child_op = self._compile_element(first_choice, current_path)
+                if child_op is not None:
+                    plan.append(child_op)
             else:
-                print(f"Warning: xs:choice at {current_path} contains no elements.")
-        elif content_model_element.tag == f"{self.XSD_NAMESPACE}complexContent":
-            extension = content_model_element.find(f"{self.XSD_NAMESPACE}extension")
-            restriction = content_model_element.find(f"{self.XSD_NAMESPACE}restriction")
+                self._warn(f"xs:choice at {current_path} contains no elements.")
+        elif code == TagCode.GROUP:
+            # An xs:group ref that is the whole content of a complexType (or of its extension)
+            self._process_group_ref(plan, content_model_element, current_path)
+        elif code == TagCode.COMPLEXCONTENT:
+            extension = self._child(content_model_element, "extension")
+            restriction = self._child(content_model_element, "restriction")
 
             if extension is not None:
                 base_type_name = extension.get("base")
@@ -226,90 +632,82 @@ class XSDToXMLGenerator:
                     base_type_name)  # Will be None for built-in or types from other namespaces
 
                 # Process attributes and content from the base type if found
-                if base_type_def:
-                    self._process_attributes(parent_xml_element, base_type_def)
-                    base_content_model = base_type_def.find(f"{self.XSD_NAMESPACE}sequence") or \
-                                         base_type_def.find(f"{self.XSD_NAMESPACE}all") or \
-                                         base_type_def.find(f"{self.XSD_NAMESPACE}choice") or \
-                                         base_type_def.find(f"{self.XSD_NAMESPACE}complexContent")
+                if base_type_def is not None:
+                    self._process_attributes(plan, base_type_def)
+                    base_content_model = self._content_model(base_type_def, BASE_CONTENT_MODEL_TAGS)
                     if base_content_model is not None:
-                        self._process_content_model(parent_xml_element, base_content_model, current_path)
-                elif base_type_name:
-                    # If base type is not found (e.g., from an imported schema), assume basic processing for it.
-                    # This is a heuristic.
-                    # print(f"Info: Base type '{base_type_name}' for extension at {current_path} not found among global types. Attributes/content might be incomplete.")
-                    pass  # Attributes within extension are still processed below
-
-                # Process attributes and sequence specifically defined in the extension
-                self._process_attributes(parent_xml_element, extension)
-                sequence = extension.find(f"{self.XSD_NAMESPACE}sequence")
-                if sequence is not None:
-                    self._process_content_model(parent_xml_element, sequence, current_path)
+                        self._process_content_model(plan, base_content_model, current_path)
+                # If base type is not found (e.g., from an imported schema), the extension's own
+                # attributes and sequence below are still processed. This is a heuristic.
+
+                # Process attributes and sequence (or group ref) specifically defined in the extension
+                self._process_attributes(plan, extension)
+                derived_content = self._content_model(extension, DERIVED_CONTENT_MODEL_TAGS)
+                if derived_content is not None:
+                    self._process_content_model(plan, derived_content, current_path)
             elif restriction is not None:
                 # Handle complexContent restriction (less common for full content model)
-                print(
-                    f"Warning: xs:complexContent with restriction at {current_path} found. This is a complex case and might not be fully generated.")
-                self._process_attributes(parent_xml_element, restriction)
-                sequence = restriction.find(f"{self.XSD_NAMESPACE}sequence")
-                if sequence is not None:
-                    self._process_content_model(parent_xml_element, sequence, current_path)
+                self._warn(
+                    f"xs:complexContent with restriction at {current_path} found. This is a complex case and might not be fully generated.")
+                self._process_attributes(plan, restriction)
+                derived_content = self._content_model(restriction, DERIVED_CONTENT_MODEL_TAGS)
+                if derived_content is not None:
+                    self._process_content_model(plan, derived_content, current_path)
             else:
-                print(f"Warning: xs:complexContent at {current_path} has no extension or restriction.")
+                self._warn(f"xs:complexContent at {current_path} has no extension or restriction.")
 
-        elif content_model_element.tag == f"{self.XSD_NAMESPACE}simpleContent":
-            extension = content_model_element.find(f"{self.XSD_NAMESPACE}extension")
-            restriction = content_model_element.find(f"{self.XSD_NAMESPACE}restriction")
+        elif code == TagCode.SIMPLECONTENT:
+            extension = self._child(content_model_element, "extension")
+            restriction = self._child(content_model_element, "restriction")
 
             if extension is not None:
                 base_type_name = extension.get("base")
                 # The text content comes from the base type of the extension
                 if base_type_name:
-                    if base_type_name.startswith("xs:"):
-                        parent_xml_element.text = generate_sample_value(base_type_name.split(":")[1])
+                    if base_type_name[:3] == "xs:":
+                        plan.append(self._text_op(base_type_name[3:]))
                     else:
                         # Custom base type for simple content
-                        parent_xml_element.text = generate_sample_value(base_type_name.split(":")[-1])
+                        plan.append(self._text_op(base_type_name[base_type_name.find(":") + 1:]))
                 else:
-                    parent_xml_element.text = generate_sample_value("string")  # Fallback
+                    plan.append(self._text_op("string"))  # Fallback
                 # Handle attributes defined within the simpleContent extension
-                self._process_attributes(parent_xml_element, extension)
+                self._process_attributes(plan, extension)
             elif restriction is not None:
                 base_type_name = restriction.get("base")
                 if base_type_name:
-                    if base_type_name.startswith("xs:"):
-                        parent_xml_element.text = generate_sample_value(base_type_name.split(":")[1])
+                    if base_type_name[:3] == "xs:":
+                        plan.append(self._text_op(base_type_name[3:]))
                     else:
                         # If there are enumerations or other facets, handle them
-                        enum_values = [e.get("value") for e in restriction.findall(f"{self.XSD_NAMESPACE}enumeration")]
+                        enum_values = self._enum_values(restriction)
                         if enum_values:
-                            parent_xml_element.text = random.choice(enum_values)
+                            plan.append(("text_enum", enum_values))
                         else:
                             # Custom base type, but no enums - generate generic sample
-                            parent_xml_element.text = generate_sample_value(base_type_name.split(":")[-1])
+                            plan.append(self._text_op(base_type_name[base_type_name.find(":") + 1:]))
                 else:
                     # No base type, check for enums directly under restriction
-                    enum_values = [e.get("value") for e in restriction.findall(f"{self.XSD_NAMESPACE}enumeration")]
+                    enum_values = self._enum_values(restriction)
                     if enum_values:
-                        parent_xml_element.text = random.choice(enum_values)
+                        plan.append(("text_enum", enum_values))
                     else:
-                        parent_xml_element.text = generate_sample_value("string")  # Fallback
+                        plan.append(self._text_op("string"))  # Fallback
                 # Handle attributes defined within the simpleContent restriction
-                self._process_attributes(parent_xml_element, restriction)
+                self._process_attributes(plan, restriction)
             else:
-                print(f"Warning: simpleContent at {current_path} has no extension or restriction.")
+                self._warn(f"simpleContent at {current_path} has no extension or restriction.")
         else:
-            print(
-                f"Warning: Unhandled content model tag: {content_model_element.tag} at {current_path}. Skipping content generation for this part.")
+            self._warn(
+                f"Unhandled content model tag: {content_model_element.tag} at {current_path}. Skipping content generation for this part.")
 
-    def _process_attributes(self, xml_element, xsd_definition):
-        """Processes attributes for an XML element from an XSD definition (element or complexType)."""
+    def _process_attributes(self, plan, xsd_definition):
+        """Compiles the attributes of an XSD definition (element or complexType) into `plan`."""
         # Find attributes directly defined within the xsd_definition (e.g., <xs:element> or <xs:complexType>)
-        for attr in xsd_definition.findall(f"{self.XSD_NAMESPACE}attribute"):
+        for attr in self._children(xsd_definition, "attribute"):
             attr_name = attr.get("name")
             if attr_name:
-                attr_type = self._get_xsd_type_name(attr)
-                attr_value = generate_sample_value(attr_type)
-                xml_element.set(attr_name, attr_value)
+                plan.append(self._attr_op(attr_name, self._get_xsd_type_name(attr)))
             else:
                 # Handle attribute references (e.g., <xs:attribute ref="tns:myAttribute"/>)
                 ref_attr = attr.get("ref")
@@ -317,144 +715,112 @@ class XSDToXMLGenerator:
                     # This is a simplification. Resolving attribute refs requires looking up global attributes.
                     # For now, we'll just set a placeholder.
                     # A full solution would parse the ref, find the global attribute, and get its type.
-                    resolved_name = ref_attr.split(":")[-1]  # Simple extraction of local name
-                    xml_element.set(resolved_name, f"ref_value_for_{resolved_name}")
+                    resolved_name = ref_attr[ref_attr.find(":") + 1:]  # Simple extraction of local name
+                    plan.append(("attr_value", resolved_name, f"ref_value_for_{resolved_name}"))
                 else:
-                    print(
-                        f"Warning: Attribute definition without 'name' or 'ref' found in {xsd_definition.tag}. Skipping.")
+                    self._warn(
+                        f"Attribute definition without 'name' or 'ref' found in {xsd_definition.tag}. Skipping.")
 
-        # Handle attributeGroup references
-        for attr_group_ref in xsd_definition.findall(f"{self.XSD_NAMESPACE}attributeGroup"):
+        # Handle attributeGroup references: the group's attributes (and nested group refs) are compiled in place
+        for attr_group_ref in self._children(xsd_definition, "attributeGroup"):
             ref_name = attr_group_ref.get("ref")
             if ref_name:
-                # This is a simplification. Resolving attributeGroup refs requires looking up global attributeGroups
-                # and then processing their contained attributes.
-                print(
-                    f"Warning: xs:attributeGroup reference '{ref_name}' found. This is not fully resolved. Skipping group content.")
+                attr_group = self.attribute_groups.get(ref_name[ref_name.find(":") + 1:])
+                if attr_group is not None:
+                    self._process_attributes(plan, attr_group)
+                else:
+                    self._warn(f"xs:attributeGroup reference '{ref_name}' could not be resolved. Skipping group content.")
 
-    def _generate_xml_element(self, parent_xml_node, xsd_element_def, current_path=""):
-        """
-        Recursively generates an XML element based on its XSD definition.
-        `xsd_element_def` is an lxml element representing an <xs:element>.
-        """
-        element_name = xsd_element_def.get("name")
-        if not element_name:
-            print(f"Warning: Skipping unnamed element in XSD at {current_path}")
+    def _process_group_ref(self, plan, group_ref, path=""):
+        """Compiles the content model of the global xs:group named by an xs:group ref into `plan`."""
+        ref_name = group_ref.get("ref")
+        group_def = self.groups.get(ref_name[ref_name.find(":") + 1:]) if ref_name else None
+        if group_def is None:
+            self._warn(f"xs:group reference '{ref_name}' at {path} could not be resolved. Skipping group content.")
             return
+        self._process_content_model(plan, self._content_model(group_def, GROUP_CONTENT_MODEL_TAGS), path)
 
-        current_path = f"{current_path}/{element_name}"
-
-        min_occurs, max_occurs = self._get_occurrence(xsd_element_def)
-
-        if min_occurs == 0 and max_occurs == 0:
-            return  # Don't generate if minOccurs=0 and maxOccurs=0
-
-        # Determine how many times to generate this element
-        num_occurrences = 1  # Default to 1 occurrence
-        if max_occurs == float('inf'):
-            # Generate at least min_occurs, up to a small random number for unbounded
-            num_occurrences = random.randint(min_occurs, min(min_occurs + 1, 2))
-            if num_occurrences == 0 and min_occurs == 0:  # Ensure at least one if minOccurs=0 but maxOccurs=unbounded
-                num_occurrences = 1
-        elif max_occurs > 1:
-            num_occurrences = random.randint(min_occurs, max_occurs)
-            if num_occurrences == 0 and min_occurs == 0:  # Ensure at least one if minOccurs=0 but maxOccurs>1
-                num_occurrences = 1
-        elif min_occurs == 0 and random.random() < 0.5:  # 50% chance to skip optional elements (minOccurs=0)
-            num_occurrences = 0
-
-        if num_occurrences == 0:
-            return  # Skip if randomly decided not to generate optional element
-
-        for _ in range(num_occurrences):
-            xml_element = etree.SubElement(parent_xml_node, element_name, nsmap=self.namespace_map)
-
-            # --- Determine Element's Type and Process ---
-            xsd_type_name = self._get_xsd_type_name(xsd_element_def)
-            xsd_type_def = self._get_type_definition(xsd_type_name)  # Will be None for built-in or inline types
-
-            if xsd_type_def is not None:
-                # This element refers to a globally defined complexType or simpleType
-                # Process attributes defined directly on the type definition
-                self._process_attributes(xml_element, xsd_type_def)
-
-                # Process content model (sequence, all, choice, complexContent, simpleContent) if it's a complex type
-                complex_type_content = xsd_type_def.find(f"{self.XSD_NAMESPACE}sequence") or \
-                                       xsd_type_def.find(f"{self.XSD_NAMESPACE}all") or \
-                                       xsd_type_def.find(f"{self.XSD_NAMESPACE}choice") or \
-                                       xsd_type_def.find(f"{self.XSD_NAMESPACE}complexContent") or \
-                                       xsd_type_def.find(f"{self.XSD_NAMESPACE}simpleContent")
-
-                if complex_type_content is not None:
-                    self._process_content_model(xml_element, complex_type_content, current_path)
-                elif xsd_type_def.tag == f"{self.XSD_NAMESPACE}simpleType":
-                    # If it's a globally defined simple type, generate text content directly
-                    restriction = xsd_type_def.find(f"{self.XSD_NAMESPACE}restriction")
-                    if restriction is not None:
-                        base_type = restriction.get("base")
-                        if base_type and base_type.startswith("xs:"):
-                            xml_element.text = generate_sample_value(base_type.split(":")[1])
-                        else:
-                            # Handle enums if present
-                            enum_values = [e.get("value") for e in
-                                           restriction.findall(f"{self.XSD_NAMESPACE}enumeration")]
-                            if enum_values:
-                                xml_element.text = random.choice(enum_values)
-                            else:
-                                xml_element.text = f"SIMPLE_TYPE_NO_BASE_OR_ENUM_{xsd_type_name}"
-                    else:
-                        xml_element.text = f"SIMPLE_TYPE_NO_RESTRICTION_{xsd_type_name}"
-                else:
-                    # Complex type with no explicit content model (e.g., empty complex type or only attributes)
-                    pass
+    # --- Plan execution ---
 
-            else:
-                # Element has an inline definition or is a built-in type
-                # Process attributes defined directly on the element definition
-                self._process_attributes(xml_element, xsd_element_def)
-
-                # Check for inline complexType definition
-                inline_complex_type = xsd_element_def.find(f"{self.XSD_NAMESPACE}complexType")
-                if inline_complex_type is not None:
-                    # Process content model of the inline complex type
-                    content_model = inline_complex_type.find(f"{self.XSD_NAMESPACE}sequence") or \
-                                    inline_complex_type.find(f"{self.XSD_NAMESPACE}all") or \
-                                    inline_complex_type.find(f"{self.XSD_NAMESPACE}choice") or \
-                                    inline_complex_type.find(f"{self.XSD_NAMESPACE}complexContent") or \
-                                    inline_complex_type.find(f"{self.XSD_NAMESPACE}simpleContent")
-                    if content_model is not None:
-                        self._process_content_model(xml_element, content_model, current_path)
-                    elif inline_complex_type.find(f"{self.XSD_NAMESPACE}simpleContent") is None:
-                        # If it's a complex type but without any sequence/all/choice/simpleContent, it might be empty or just has attributes.
-                        pass  # Attributes are already processed.
-                else:
-                    # Element is a simple type (either built-in or inline simpleType)
-                    inline_simple_type = xsd_element_def.find(f"{self.XSD_NAMESPACE}simpleType")
-                    if inline_simple_type is not None:
-                        restriction = inline_simple_type.find(f"{self.XSD_NAMESPACE}restriction")
-                        if restriction is not None:
-                            base_type = restriction.get("base")
-                            if base_type and base_type.startswith("xs:"):
-                                xml_element.text = generate_sample_value(base_type.split(":")[1])
-                            else:
-                                enum_values = [e.get("value") for e in
-                                               restriction.findall(f"{self.XSD_NAMESPACE}enumeration")]
-                                if enum_values:
-                                    xml_element.text = random.choice(enum_values)
-                                else:
-                                    xml_element.text = f"INLINE_SIMPLE_TYPE_NO_BASE_OR_ENUM"
-                        else:
-                            xml_element.text = f"INLINE_SIMPLE_TYPE_NO_RESTRICTION"
-                    else:
-                        # Default to text content for simple elements without inline definitions
-                        xml_element.text = generate_sample_value(xsd_type_name)
+    def _plan_is_deterministic(self, plan):
+        """
+        True if `plan` generates the same subtree every time: only fixed attribute/text values, and children
+        that occur a fixed number of times and are deterministic themselves. Cached per plan.
+        """
+        key = id(plan)  # Plans are kept alive by the plan caches, so their ids are stable
+        try:
+            return self._deterministic_plans[key]
+        except KeyError:
+            pass
+        # Recursive plans are not treated as deterministic; mark this one before looking at its children
+        self._deterministic_plans[key] = False
+        deterministic = all(
+            op[0] == "attr_value" or op[0] == "text_value"
+            or (op[0] == "child" and op[2] == op[3] and self._plan_is_deterministic(op[4]))
+            for op in plan)
+        self._deterministic_plans[key] = deterministic
+        return deterministic
 
-    def generate_xml(self, root_element_name=None):
+    def _run_plan(self, xml_node, plan, depth=0):
         """
-        Generates the root XML element and recursively populates it.
-        For schemas like camt.053.001.08, the root element 'Document' is often
-        the only direct child of xs:schema.
+        Applies `plan` to `xml_node`, then the plans of the generated children, and so on.
+        Uses an explicit stack instead of recursion; children of one node are attached with a single extend().
+        Repeated elements with a deterministic plan are built once and deep-copied for the other occurrences.
+        `depth` is the nesting level of `xml_node`; a ValueError is raised if children would go deeper than MAX_DEPTH.
         """
+        # Everything the loop calls is bound to a local once, rather than looked up per op
+        new_element = etree.Element
+        deepcopy = copy.deepcopy
+        times = self._times
+        num_occurrences = self._num_occurrences
+        is_deterministic = self._plan_is_deterministic
+        choice = _choice
+        stack = [(xml_node, plan, depth)]
+        pop, push = stack.pop, stack.append
+        while stack:
+            xml_element, plan, depth = pop()
+            set_attr = xml_element.set
+            children = []
+            add_child = children.append
+            for op in plan:
+                kind = op[0]
+                if kind == "child":
+                    _, qname, min_occurs, max_occurs, child_plan = op
+                    count = num_occurrences(min_occurs, max_occurs)
+                    if count and depth >= MAX_DEPTH:
+                        raise _depth_error(qname)
+                    if count > 1 and is_deterministic(child_plan):
+                        prototype = new_element(qname)
+                        self._run_plan(prototype, child_plan, depth + 1)
+                        add_child(prototype)
+                        for _ in range(count - 1):
+                            add_child(deepcopy(prototype))
+                        continue
+                    for _ in range(count):
+                        # Only the root carries the namespace declaration; qualified children reuse it when attached
+                        child = new_element(qname)
+                        add_child(child)
+                        push((child, child_plan, depth + 1))
+                elif kind == "attr":
+                    set_attr(op[1], op[2](times))
+                elif kind == "attr_value":
+                    set_attr(op[1], op[2])
+                elif kind == "text":
+                    xml_element.text = op[1](times)
+                elif kind == "text_value":
+                    xml_element.text = op[1]
+                else:  # "text_enum"
+                    xml_element.text = choice(op[1])
+            if children:
+                xml_element.extend(children)
+
+    def _root_plan(self, root_xsd_element):
+        """Returns the plan for the attributes and content of the document's root element."""
+        element_op = self._compile_element(root_xsd_element)
+        return element_op[4] if element_op is not None else []
+
+    def _select_root_element(self, root_element_name=None):
+        """Returns the global <xs:element> to generate the document from."""
         # Find the main root element definition in the XSD
         # For camt.xsd, this is typically <xs:element name="Document">
         selected_root_xsd_element = None
@@ -462,30 +828,160 @@ class XSDToXMLGenerator:
         if root_element_name:
             # If a specific root name is given, try to find it among global elements
             # Use direct find for elements that are direct children of the schema root
-            selected_root_xsd_element = self.schema_doc.getroot().find(
-                f"{self.XSD_NAMESPACE}element[@name='{root_element_name}']")
+            selected_root_xsd_element = next((el for el in self._children(self.schema_doc.getroot(), "element")
+                                              if el.get("name") == root_element_name), None)
             if selected_root_xsd_element is None:
                 raise ValueError(f"Root element '{root_element_name}' not found in XSD.")
         else:
             # If no specific root name, assume the first global element is the intended root.
             # This is common for single-document schemas like camt.053.
-            selected_root_xsd_element = self.schema_doc.getroot().find(f"{self.XSD_NAMESPACE}element")
+            selected_root_xsd_element = self._child(self.schema_doc.getroot(), "element")
             if selected_root_xsd_element is None:
                 raise ValueError("No global element definition found in the XSD to start XML generation.")
             print(
                 f"Info: No specific root element specified. Using first global element: '{selected_root_xsd_element.get('name')}'")
 
+        return selected_root_xsd_element
+
+    def generate_xml(self, root_element_name=None):
+        """
+        Generates the root XML element and recursively populates it.
+        For schemas like camt.053.001.08, the root element 'Document' is often
+        the only direct child of xs:schema.
+        """
+        selected_root_xsd_element = self._select_root_element(root_element_name)
         root_name = selected_root_xsd_element.get("name")
+        root_plan = self._root_plan(selected_root_xsd_element)
 
         # Ensure the target namespace is correctly associated with the root element
         # The 'None' key sets the default namespace.
-        root_element = etree.Element(root_name, nsmap=self.namespace_map)
+        root_element = etree.Element(self._qname(root_name), nsmap=self.namespace_map)
 
-        # Process the selected root element's definition
-        self._generate_xml_element(root_element, selected_root_xsd_element)
+        # One timestamp for every date/time value in this document
+        self._times = _time_strings(datetime.datetime.now(datetime.timezone.utc))
+
+        # The root element is the selected element itself: its plan fills it directly
+        self._run_plan(root_element, root_plan)
 
         return etree.tostring(root_element, pretty_print=True, encoding='utf-8', xml_declaration=True)
 
+    def generate_xml_to(self, out_path, root_element_name=None):
+        """
+        Generates the same document as generate_xml(), but streams it to `out_path` with etree.xmlfile
+        while it is generated, so neither the whole tree nor a serialized copy is held in memory.
+        The document is written to a temporary file next to `out_path` and only moved into place once
+        generation has succeeded.
+        """
+        selected_root_xsd_element = self._select_root_element(root_element_name)
+        root_name = selected_root_xsd_element.get("name")
+        root_plan = self._root_plan(selected_root_xsd_element)
+
+        # One timestamp for every date/time value in this document
+        self._times = _time_strings(datetime.datetime.now(datetime.timezone.utc))
+        root_attributes, root_text = self._plan_values(root_plan)
+        root_children = self._iter_children(root_plan)
+        first_child = next(root_children, None)
+
+        partial_path = f"{out_path}.part"
+        try:
+            with open(partial_path, "wb") as out_file:
+                with etree.xmlfile(out_file, encoding='utf-8') as xf:
+                    xf.write_declaration()
+                    if first_child is None and root_text is None:
+                        # An empty root is written as <Name/>, like tostring() does
+                        xf.write(etree.Element(self._qname(root_name), root_attributes, nsmap=self.namespace_map))
+                    else:
+                        with xf.element(self._qname(root_name), root_attributes, nsmap=self.namespace_map):
+                            if root_text is not None:
+                                xf.write(root_text)
+                            if first_child is not None:
+                                self._stream_children(xf, itertools.chain((first_child,), root_children))
+                                xf.write("\n")
+                out_file.write(b"\n")
+            os.replace(partial_path, out_path)
+        except BaseException:
+            # Don't leave a truncated document behind
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+    def _iter_children(self, plan):
+        """Yields (qname, plan) for every child element instance a plan generates, in document order."""
+        for op in plan:
+            if op[0] == "child":
+                _, qname, min_occurs, max_occurs, child_plan = op
+                for _ in range(self._num_occurrences(min_occurs, max_occurs)):
+                    yield qname, child_plan
+
+    def _plan_values(self, plan):
+        """Resolves the attributes and text a plan gives one element instance."""
+        times = self._times
+        attributes = {}
+        text = None
+        for op in plan:
+            kind = op[0]
+            if kind == "attr":
+                attributes[op[1]] = op[2](times)
+            elif kind == "attr_value":
+                attributes[op[1]] = op[2]
+            elif kind == "text":
+                text = op[1](times)
+            elif kind == "text_value":
+                text = op[1]
+            elif kind == "text_enum":
+                text = _choice(op[1])
+        return attributes, text
+
+    def _stream_children(self, xf, children, depth=1):
+        """
+        Streams `children`, (qname, plan) pairs as yielded by _iter_children(), into the element currently
+        open in `xf`, indented as if pretty-printed `depth` levels deep. Uses an explicit stack of open
+        elements; an element's start tag is only written once its first child is known.
+        Raises ValueError if elements would nest deeper than MAX_DEPTH below the root.
+        """
+        # Each frame is [qname, attributes, text, child iterator, open xf.element context or None]
+        frames = [[None, None, None, children, xf]]
+        try:
+            while frames:
+                frame = frames[-1]
+                child = next(frame[3], None)
+                if child is not None:
+                    if frame[4] is None:
+                        # First child: open the parent now that we know it has element content
+                        frame[4] = xf.element(frame[0], frame[1])
+                        frame[4].__enter__()
+                        if frame[2] is not None:
+                            xf.write(frame[2])
+                    qname, child_plan = child
+                    level = depth + len(frames) - 1
+                    if level > MAX_DEPTH:
+                        raise _depth_error(qname)
+                    attributes, text = self._plan_values(child_plan)
+                    xf.write("\n" + "  " * level)
+                    frames.append([qname, attributes, text, self._iter_children(child_plan), None])
+                    continue
+
+                frames.pop()
+                if not frames:
+                    break  # The element we were called for stays open for the caller
+                if frame[4] is not None:
+                    xf.write("\n" + "  " * (depth + len(frames) - 1))
+                    frame[4].__exit__(None, None, None)
+                elif frame[2] is None:
+                    # Empty element: written as <Name/> like tostring() does. Under the local name only, since
+                    # xmlfile would give a namespaced Element its own prefix; the open default namespace covers it.
+                    qname = frame[0]
+                    xf.write(etree.Element(qname[qname.find("}") + 1:], frame[1]))
+                else:
+                    with xf.element(frame[0], frame[1]):
+                        xf.write(frame[2])
+        except BaseException:
+            # Close the elements this call opened so xmlfile unwinds cleanly and the original error surfaces
+            for frame in reversed(frames[1:]):
+                if frame[4] is not None:
+                    frame[4].__exit__(None, None, None)
+            raise
+
 
 ### Command Line Interface and Example Usage
 
@@ -497,21 +993,32 @@ def main():
     parser.add_argument("xsd_file", help="Path to the input XSD schema file.")
     parser.add_argument("-o", "--output", default="output.xml",
                         help="Path to the output XML file (default: output.xml).")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Print warnings about schema constructs that are skipped or only partly generated.")
     parser.add_argument("-r", "--root", help="Name of the root element to start generation from "
                                              "(if XSD has multiple global elements). "
                                              "If not specified, the first global element is used.")
+    parser.add_argument("--validate", action="store_true",
+                        help="Validate the generated XML against the XSD and report any errors.")
 
     args = parser.parse_args()
 
     try:
-        generator = XSDToXMLGenerator(args.xsd_file)
-        xml_output = generator.generate_xml(root_element_name=args.root)
-
-        with open(args.output, "wb") as f:
-            f.write(xml_output)
+        generator = XSDToXMLGenerator(args.xsd_file, verbose=args.verbose)
+        # Stream straight to the output file instead of serializing the whole tree in memory first
+        generator.generate_xml_to(args.output, root_element_name=args.root)
 
         print(f"\nXML generated successfully and saved to: {args.output}")
 
+        if args.validate:
+            errors = generator.validate(args.output)
+            if errors:
+                print(f"Validation failed with {len(errors)} error(s):")
+                for error in errors:
+                    print(f"  {error}")
+            else:
+                print("Validation passed.")
+
     except (ValueError, FileNotFoundError, Exception) as e:
         print(f"Error: {e}")
 